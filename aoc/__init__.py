@@ -0,0 +1 @@
+"""Shared tooling for running, timing and checking the daily puzzle solvers."""
@@ -0,0 +1,5 @@
+import sys
+
+from aoc.run import main
+
+sys.exit(main())
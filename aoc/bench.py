@@ -0,0 +1,132 @@
+"""Benchmarks every part against a stored baseline, failing on regressions."""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from aoc.days import DAYS, ROOT
+from aoc.instrument import instrument
+from aoc.run import iter_jobs, parse_day, parse_param, run, to_json
+
+
+# Tracked alongside the code, unlike the disposable caches in .cache
+BASELINE_PATH = ROOT / 'bench' / 'baseline.json'
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """
+    Returns the p-th percentile (0 < p <= 100) of the values by nearest rank.
+    """
+    values = sorted(values)
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+def benchmark(day: int, part: int, path: Optional[str] = None, repeat: int = 5,
+        **params) -> Dict[str, Any]:
+    """
+    Solves the given part the given number of times, plus once more with memory
+    tracing, and returns a record of the median and 95th percentile solve times
+    and the peak traced memory.
+    """
+    path = path or DAYS[day].input
+    record = {'day': day, 'part': part, 'input': path, 'repeat': repeat}
+    times = []
+    for _ in range(repeat):
+        result = run(day, part, path, **params)
+        if 'error' in result:
+            record['error'] = result['error']
+            return record
+        times.append(result['solve_time'])
+
+    result = instrument(day, part, path, hot=[], **params)
+    if 'error' in result:
+        record['error'] = result['error']
+        return record
+
+    record.update(answer=result['answer'], median=statistics.median(times),
+                  p95=percentile(times, 95), peak_memory=result['peak_memory'])
+    return record
+
+def benchmark_key(record: Dict[str, Any]) -> str:
+    return f'{record["day"]}.{record["part"]}:{record["input"]}'
+
+def compare(record: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+        min_delta: float) -> List[str]:
+    """
+    Returns a list of regressions of the benchmark record relative to its
+    baseline. Times regress if they exceed the baseline by both the relative
+    threshold and min_delta seconds; memory regresses if it exceeds the
+    baseline by the relative threshold. A changed answer is also reported.
+    """
+    regressions = []
+    if json.loads(to_json(record['answer'])) != baseline['answer']:
+        regressions.append(f'answer changed from {baseline["answer"]} to {record["answer"]}')
+    for stat in ('median', 'p95'):
+        if record[stat] > baseline[stat] * (1 + threshold) and \
+                record[stat] - baseline[stat] > min_delta:
+            regressions.append(f'{stat} time {baseline[stat]:.4f}s -> {record[stat]:.4f}s')
+    if record['peak_memory'] > baseline['peak_memory'] * (1 + threshold):
+        regressions.append(f'peak memory {baseline["peak_memory"]}B -> {record["peak_memory"]}B')
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('days', nargs='*', type=parse_day,
+                        help='days to benchmark (default: all)')
+    parser.add_argument('-p', '--part', nargs='+', type=int, default=[1, 2], dest='parts')
+    parser.add_argument('-i', '--input', help='input path, absolute or relative to the day directory')
+    parser.add_argument('--param', action='append', default=[], metavar='KEY=VALUE')
+    parser.add_argument('--examples', action='store_true', help='benchmark the examples')
+    parser.add_argument('-n', '--repeat', type=int, default=5)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true',
+                        help='save the results to the baseline instead of comparing')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='maximum relative slowdown (default: %(default)s)')
+    parser.add_argument('--min-delta', type=float, default=0.005,
+                        help='minimum absolute slowdown in seconds (default: %(default)s)')
+    args = parser.parse_args(argv)
+    params = dict(parse_param(p) for p in args.param)
+
+    baselines = {}
+    if args.baseline.exists():
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+    elif not args.save:
+        parser.error(f'no baseline at {args.baseline}; run with --save first')
+
+    failed = False
+    jobs = iter_jobs(args.days or sorted(DAYS), args.parts, args.input, params, args.examples)
+    for day, part, path, job_params in jobs:
+        record = benchmark(day, part, path, args.repeat, **job_params)
+        key = benchmark_key(record)
+
+        if 'error' in record:
+            failed = True
+        elif args.save:
+            baselines[key] = json.loads(to_json(record))
+        elif key not in baselines:
+            record['regressions'] = []
+            print(f'{key}: no baseline', file=sys.stderr)
+        else:
+            record['regressions'] = compare(record, baselines[key], args.threshold, args.min_delta)
+            for regression in record['regressions']:
+                print(f'{key}: {regression}', file=sys.stderr)
+            failed |= len(record['regressions']) > 0
+        print(to_json(record), flush=True)
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+
+    return int(failed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
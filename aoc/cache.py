@@ -0,0 +1,154 @@
+"""Persistent on-disk caches of puzzle answers and parsed inputs."""
+
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from aoc.days import ROOT, input_paths, resolve_params
+
+
+CACHE_DIR = ROOT / '.cache'
+
+
+def hash_files(paths: Iterable[Path]) -> str:
+    """
+    Returns the SHA-256 hex digest of the concatenated contents of the files.
+    """
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            while chunk := f.read(1 << 20):
+                h.update(chunk)
+    return h.hexdigest()
+
+def local_modules(mod: ModuleType) -> Set[ModuleType]:
+    """
+    Returns the given module and any modules within the repository which it
+    references directly, i.e. the modules whose code can affect its answers.
+    """
+    modules = {mod}
+    for obj in vars(mod).values():
+        if not isinstance(obj, ModuleType):
+            obj = inspect.getmodule(obj)
+        path = getattr(obj, '__file__', None)
+        if path is not None and Path(path).resolve().is_relative_to(ROOT):
+            modules.add(obj)
+    return modules
+
+def code_version(mod: ModuleType) -> str:
+    """
+    Returns a hash of the source code of the given module, the modules within
+    the repository which it references, and the input parsers.
+    """
+    import aoc.days
+    paths = {Path(m.__file__).resolve() for m in local_modules(mod) | {aoc.days}}
+    return hash_files(sorted(paths))
+
+
+def _digest(*components: Any) -> str:
+    return hashlib.sha256(repr(components).encode()).hexdigest()
+
+
+class DiskCache:
+    """
+    An on-disk cache of pickled values, holding at most max_entries values and
+    evicting the least recently used values when full.
+    """
+
+    def __init__(self, directory: Path, max_entries: int) -> None:
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Returns (True, value) if the key is cached, otherwise (False, None).
+        """
+        path = self.directory / key
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return False, None
+        os.utime(path)  # Mark as recently used
+        return True, value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Caches the value under the given key, evicting old values if needed.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so that concurrent readers never see
+        # a partially written value
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.directory / key)
+        self.evict()
+
+    def evict(self, max_entries: Optional[int] = None) -> None:
+        """
+        Removes the least recently used values until at most max_entries (by
+        default, the cache capacity) remain.
+        """
+        max_entries = self.max_entries if max_entries is None else max_entries
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.startswith('.tmp-'):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    continue
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - max_entries)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class AnswerCache(DiskCache):
+    """
+    A cache of answers keyed by day, part, input file contents, input
+    parameters and solver source code.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR / 'answers', max_entries: int = 1024) -> None:
+        super().__init__(directory, max_entries)
+
+    def key(self, mod: ModuleType, day: int, part: int, path: str, params: Dict[str, Any]) -> str:
+        """
+        Returns the cache key for the given solver and input.
+        """
+        params = sorted(resolve_params(day, params).items())
+        return _digest(day, part, hash_files(input_paths(day, path)), params, code_version(mod))
+
+
+class ParseCache(DiskCache):
+    """
+    A cache of parsed solver arguments keyed by day, part, input file path,
+    size and modification time, input parameters and parser source code.
+
+    Keying on file metadata rather than contents means a cache lookup does not
+    need to read the input at all. Parsed arguments are stored in the highest
+    pickle protocol, which loads far faster than re-parsing the text.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR / 'parsed', max_entries: int = 64) -> None:
+        super().__init__(directory, max_entries)
+
+    def key(self, mod: ModuleType, day: int, part: int, path: str, params: Dict[str, Any]) -> str:
+        """
+        Returns the cache key for the given input and parser.
+        """
+        stats = []
+        for p in input_paths(day, path):
+            stat = p.stat()
+            stats.append((str(p.resolve()), stat.st_size, stat.st_mtime_ns))
+        params = sorted(resolve_params(day, params).items())
+        return _digest(day, part, stats, params, code_version(mod))
@@ -0,0 +1,96 @@
+"""Differential checker comparing candidate solvers against the reference solvers."""
+
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+
+from contextlib import redirect_stdout
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+from aoc.days import DAYS, get_solver, load_args, load_module
+from aoc.generate import GENERATORS, generate
+from aoc.run import to_json
+
+
+def import_callable(target: str) -> Callable[..., Any]:
+    """
+    Imports and returns the callable at the given "package.module:function" path.
+    """
+    module_name, func_name = target.split(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+def differential_check(day: int, part: int, candidate: Callable[..., Any], size: int,
+        seed: Optional[int] = None, from_path: bool = False) -> Dict[str, Any]:
+    """
+    Generates an input of the given size for the given day, and solves the
+    given part with both the reference solver and the candidate. The candidate
+    receives the same parsed arguments as the reference solver or, if from_path
+    is True, the input path and parameters instead.
+
+    Returns a record of both answers, whether they match, and the time taken by
+    each solver (excluding parsing).
+    """
+    mod = load_module(day)
+    reference = get_solver(mod, day, part)
+    text, params = generate(day, size, seed)
+
+    fd, path = tempfile.mkstemp(prefix=f'day{day}-', suffix='.txt')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+
+        with redirect_stdout(sys.stderr):
+            # Parse separately for each solver, as some solvers mutate their inputs
+            args = load_args(mod, day, part, path, **params)
+            t0 = perf_counter()
+            expected = reference(*args)
+            t1 = perf_counter()
+
+            if from_path:
+                t2 = perf_counter()
+                actual = candidate(path, **params)
+            else:
+                args = load_args(mod, day, part, path, **params)
+                t2 = perf_counter()
+                actual = candidate(*args)
+            t3 = perf_counter()
+    finally:
+        os.remove(path)
+
+    return {
+        'day': day, 'part': part, 'size': size, 'seed': seed, 'match': actual == expected,
+        'reference': expected, 'candidate': actual,
+        'reference_time': t1 - t0, 'candidate_time': t3 - t2,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('day', type=int, choices=sorted(GENERATORS))
+    parser.add_argument('part', type=int, choices=[1, 2])
+    parser.add_argument('candidate', help='solver to check, as "package.module:function"')
+    parser.add_argument('-n', '--size', type=int, nargs='+', required=True)
+    parser.add_argument('-s', '--seed', type=int, nargs='+', default=[0])
+    parser.add_argument('--from-path', action='store_true',
+                        help='pass the input path and parameters to the candidate')
+    args = parser.parse_args(argv)
+
+    if args.part not in DAYS[args.day].solvers:
+        parser.error(f'day {args.day} has no part {args.part}')
+    candidate = import_callable(args.candidate)
+
+    failed = False
+    for size in args.size:
+        for seed in args.seed:
+            record = differential_check(args.day, args.part, candidate, size, seed, args.from_path)
+            failed |= not record['match']
+            print(to_json(record), flush=True)
+
+    return int(failed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""Registry describing how to load the input for, and solve, each day."""
+
+import importlib
+import inspect
+import sys
+
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+from aoc.grid import Grid
+from aoc.ints import read_ints
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+Parser = Callable[..., Tuple]
+
+
+class Example(NamedTuple):
+    filename: str
+    params: Dict[str, Any]
+    answers: Dict[int, Any]
+
+
+class Alternative(NamedTuple):
+    part: int
+    solver: str
+    from_path: bool = False         # Takes the input path, rather than parsed arguments
+    params: Dict[str, Any] = {}     # Keyword arguments, e.g. a small chunk size
+
+
+class DaySpec(NamedTuple):
+    day: int
+    parse: Parser
+    solvers: Dict[int, str]
+    input: str
+    params: Dict[str, Any]
+    examples: List[Example]
+    alternatives: List[Alternative] = []
+
+
+def load_module(day: int) -> ModuleType:
+    """
+    Imports and returns the solver module for the given day.
+    """
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    return importlib.import_module(f'day{day}.day{day}')
+
+def resolve_input(day: int, path: str) -> Path:
+    """
+    Returns the given input path, falling back to a path relative to the day's
+    directory if it does not exist relative to the working directory.
+    """
+    path = Path(path)
+    if not path.exists() and not path.is_absolute():
+        path = ROOT / f'day{day}' / path
+    return path
+
+def get_solver(mod: ModuleType, day: int, part: int) -> Callable[..., Any]:
+    """
+    Returns the function solving the given part of the given day.
+    """
+    return getattr(mod, DAYS[day].solvers[part])
+
+def resolve_params(day: int, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the parameters used to load an input for the given day. Parameters
+    default to those of the real input, and parameters which do not apply to
+    the given day are ignored.
+    """
+    spec = DAYS[day]
+    accepted = inspect.signature(spec.parse).parameters
+    return {k: v for k, v in {**spec.params, **params}.items() if k in accepted}
+
+def load_args(mod: ModuleType, day: int, part: int, path: str, **params) -> Tuple:
+    """
+    Parses the input file at the given path and returns the arguments for the
+    solver of the given part.
+    """
+    return DAYS[day].parse(mod, resolve_input(day, path), part, **resolve_params(day, params))
+
+
+def input_paths(day: int, path: str) -> List[Path]:
+    """
+    Returns the paths of all files read when loading the given input.
+    """
+    path = resolve_input(day, path)
+    return _day5_paths(path) if day == 5 else [path]
+
+
+def _read_lines(path: Path) -> List[str]:
+    with open(path) as f:
+        return f.readlines()
+
+def _read(path: Path) -> str:
+    with open(path) as f:
+        return f.read()
+
+
+def _parse_day1(mod, path, part):
+    numbers = read_ints(path)
+    return numbers.column(0, 2), numbers.column(1, 2)
+
+def _parse_day2(mod, path, part):
+    return read_ints(path),
+
+def _parse_day3(mod, path, part, line=None):
+    return (_read(path) if line is None else _read_lines(path)[line]),
+
+def _parse_day4(mod, path, part):
+    return Grid.from_lines(_read_lines(path), padding=3),
+
+def _day5_paths(path):
+    # Rules and updates are either split across "-pt1" and "-pt2" files, or are
+    # separated by a blank line in a single file
+    if '-pt1' in path.name:
+        return [path, path.with_name(path.name.replace('-pt1', '-pt2'))]
+    return [path]
+
+def _parse_day5(mod, path, part):
+    if len(paths := _day5_paths(path)) == 2:
+        rules, updates = map(_read, paths)
+    else:
+        rules, updates = _read(path).split('\n\n')
+    rules = mod.parse_rules(c.strip() for c in rules.strip().split('\n'))
+    updates = [list(map(int, u.split(','))) for u in updates.strip().split('\n')]
+    return rules, updates
+
+def _parse_day6(mod, path, part):
+    return Grid.from_lines(_read_lines(path), padding=1),
+
+def _parse_day7(mod, path, part):
+    return read_ints(path),
+
+def _parse_day8(mod, path, part):
+    return Grid.from_lines(_read_lines(path)),
+
+def _parse_day9(mod, path, part):
+    return [int(n) for n in _read(path).strip()],
+
+def _parse_day10(mod, path, part):
+    return Grid.from_lines(_read_lines(path), padding=1),
+
+def _parse_day11(mod, path, part):
+    return [int(n) for n in _read(path).split(' ')], (25 if part == 1 else 75)
+
+def _parse_day12(mod, path, part):
+    return Grid.from_lines(_read_lines(path), padding=1),
+
+def _parse_day13(mod, path, part):
+    return mod.parse_machines(read_ints(path)),
+
+def _parse_day14(mod, path, part, mapsize):
+    return mod.parse_robots(read_ints(path)), tuple(mapsize)
+
+def _parse_day15(mod, path, part):
+    warehouse_map, moves = _read(path).split('\n\n')
+    return (*mod.parse_warehouse(warehouse_map, double_width=(part == 2)), moves)
+
+def _parse_day16(mod, path, part):
+    return mod.parse_input(_read_lines(path))
+
+def _parse_day17(mod, path, part):
+    return mod.parse_input(_read(path))
+
+def _parse_day18(mod, path, part, map_size, n_bytes):
+    corrupted = mod.parse_input(read_ints(path))
+    memory = mod.create_memory(tuple(map_size), corrupted[:n_bytes])
+    return (memory,) if part == 1 else (memory, corrupted[n_bytes:])
+
+def _parse_day19(mod, path, part):
+    return mod.parse_input(_read(path))
+
+def _parse_day23(mod, path, part):
+    return [tuple(line.strip().split('-')) for line in _read_lines(path)],
+
+
+PARTS = {1: 'part1', 2: 'part2'}
+
+# Days are listed by hand rather than discovered from the dayN directories,
+# since every day needs its own parser and solver arguments
+DAYS: Dict[int, DaySpec] = {spec.day: spec for spec in [
+    DaySpec(1, _parse_day1, PARTS, 'input.txt', {}, [
+        Example('example.txt', {}, {1: 11, 2: 31})], [
+        Alternative(1, 'part1_numpy'),
+        Alternative(2, 'part2_numpy'),
+        Alternative(1, 'part1_external', True, {'chunk_size': 2}),
+        Alternative(2, 'part2_external', True, {'chunk_size': 2})]),
+    DaySpec(2, _parse_day2, PARTS, 'input.txt', {}, [
+        Example('example.txt', {}, {1: 2, 2: 4}),
+        Example('example-blank-line.txt', {}, {1: 2, 2: 3})], [
+        Alternative(1, 'part1_numpy'),
+        Alternative(2, 'part2_numpy'),
+        Alternative(1, 'part1_streaming', True),
+        Alternative(2, 'part2_streaming', True)]),
+    DaySpec(3, _parse_day3, PARTS, 'input.txt', {}, [
+        Example('example.txt', {'line': 0}, {1: 161}),
+        Example('example.txt', {'line': 1}, {2: 48}),
+        Example('example-part1-only.txt', {}, {1: 161}),
+        Example('example-part2-only.txt', {}, {2: 48})], [
+        Alternative(1, 'part1_mmap', True, {'chunk_size': 4}),
+        Alternative(2, 'part2_mmap', True, {'chunk_size': 4}),
+        Alternative(1, 'part1_parallel', True, {'workers': 2}),
+        Alternative(2, 'part2_parallel', True, {'workers': 2})]),
+    DaySpec(4, _parse_day4, PARTS, 'input.txt', {}, [
+        Example('example.txt', {}, {1: 18, 2: 9})], [
+        Alternative(1, 'part1_automaton'),
+        Alternative(2, 'part2_numpy'),
+        Alternative(1, 'part1_streaming', True),
+        Alternative(2, 'part2_streaming', True)]),
+    DaySpec(5, _parse_day5, PARTS, 'input-pt1.txt', {}, [
+        Example('example-pt1.txt', {}, {1: 143, 2: 123})], [
+        Alternative(1, 'part1_numpy')]),
+    DaySpec(6, _parse_day6, PARTS, 'input.txt', {}, [
+        Example('example.txt', {}, {1: 41, 2: 6})]),
+    DaySpec(7, _parse_day7, PARTS, 'input.txt', {}, [
+        Example('example.txt', {}, {1: 3749, 2: 11387})]),
+    DaySpec(8, _parse_day8, PARTS, 'input.txt', {}, [
+        Example('example.txt', {}, {1: 14, 2: 34})]),
+    DaySpec(9, _parse_day9, PARTS, 'input.txt', {}, [
+        Example('example.txt', {}, {1: 1928, 2: 2858})]),
+    DaySpec(10, _parse_day10, PARTS, 'input.txt', {}, [
+        Example('example.txt', {}, {1: 36, 2: 81})]),
+    DaySpec(11, _parse_day11, {1: 'evolve_and_count', 2: 'evolve_and_count'}, 'input.txt', {}, [
+        Example('example.txt', {}, {1: 55312})]),
+    DaySpec(12, _parse_day12, PARTS, 'input.txt', {}, [
+        Example('example.txt', {}, {1: 1930, 2: 1206})]),
+    DaySpec(13, _parse_day13, PARTS, 'input.txt', {}, [
+        Example('example.txt', {}, {1: 480})]),
+    DaySpec(14, _parse_day14, PARTS, 'input.txt', {'mapsize': (101, 103)}, [
+        Example('example.txt', {'mapsize': (11, 7)}, {1: 12})]),
+    DaySpec(15, _parse_day15, PARTS, 'input.txt', {}, [
+        Example('example-part1-only.txt', {}, {1: 2028}),
+        Example('example-part2-only.txt', {}, {2: 618}),
+        Example('example.txt', {}, {1: 10092, 2: 9021})]),
+    DaySpec(16, _parse_day16, PARTS, 'input.txt', {}, [
+        Example('example-1.txt', {}, {1: 7036, 2: 45}),
+        Example('example-2.txt', {}, {1: 11048, 2: 64})]),
+    DaySpec(17, _parse_day17, {1: 'part1'}, 'input.txt', {}, [
+        Example('example-part1-only.txt', {}, {1: '4,6,3,5,6,3,5,2,1,0'})]),
+    DaySpec(18, _parse_day18, PARTS, 'input.txt', {'map_size': (71, 71), 'n_bytes': 1024}, [
+        Example('example.txt', {'map_size': (7, 7), 'n_bytes': 12}, {1: 22, 2: (6, 1)})]),
+    DaySpec(19, _parse_day19, PARTS, 'input.txt', {}, [
+        Example('example.txt', {}, {1: 6, 2: 16})]),
+    DaySpec(23, _parse_day23, PARTS, 'input.txt', {}, [
+        Example('example.txt', {}, {1: 7, 2: 'co,de,ka,ta'})]),
+]}
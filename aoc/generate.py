@@ -0,0 +1,346 @@
+"""Generators for synthetic puzzle inputs of arbitrary size."""
+
+import argparse
+import random
+import string
+import sys
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+Generated = Tuple[str, Dict[str, Any]]
+Generator = Callable[[int, random.Random], Generated]
+
+DIRECTIONS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+
+def _grid_str(grid: List[List[str]]) -> str:
+    return '\n'.join(''.join(row) for row in grid) + '\n'
+
+
+def generate_day1(size: int, rng: random.Random) -> Generated:
+    """
+    Two columns of size location IDs, with repeats in the right column.
+    """
+    right_pool = [rng.randint(10000, 99999) for _ in range(max(1, size // 4))]
+    lines = [f'{rng.randint(10000, 99999)}   {rng.choice(right_pool)}' for _ in range(size)]
+    return '\n'.join(lines) + '\n', {}
+
+def generate_day2(size: int, rng: random.Random) -> Generated:
+    """
+    size reports of 5-8 levels, mostly monotonic with occasional bad levels.
+    """
+    reports = []
+    for _ in range(size):
+        sgn = rng.choice((-1, 1))
+        report = [rng.randint(20, 80)]
+        for _ in range(rng.randint(4, 7)):
+            step = rng.randint(1, 3) if rng.random() > 0.1 else rng.randint(-2, 5)
+            report.append(report[-1] + sgn * step)
+        reports.append(' '.join(map(str, report)))
+    return '\n'.join(reports) + '\n', {}
+
+def generate_day3(size: int, rng: random.Random) -> Generated:
+    """
+    Roughly size characters of corrupted memory containing well-formed and
+    malformed mul, do and don't instructions.
+    """
+    noise = string.ascii_letters + string.digits + string.punctuation + ' '
+    tokens = []
+    length = 0
+    while length < size:
+        r = rng.random()
+        if r < 0.15:
+            token = f'mul({rng.randint(1, 999)},{rng.randint(1, 999)})'
+        elif r < 0.2:
+            token = rng.choice(('do()', "don't()", 'mul(4*', 'mul ( 2 , 4 )', 'do_not()'))
+        else:
+            token = ''.join(rng.choices(noise, k=rng.randint(1, 8)))
+        tokens.append(token)
+        length += len(token)
+    return ''.join(tokens), {}
+
+def generate_day4(size: int, rng: random.Random) -> Generated:
+    """
+    A size x size grid of the letters X, M, A and S.
+    """
+    return _grid_str([rng.choices('XMAS', k=size) for _ in range(size)]), {}
+
+def generate_day5(size: int, rng: random.Random) -> Generated:
+    """
+    Ordering rules totally ordering 49 two-digit pages, and size updates of an
+    odd number of those pages, separated by a blank line.
+    """
+    pages = rng.sample(range(10, 100), 49)
+    rules = [f'{a}|{b}' for i, a in enumerate(pages) for b in pages[i + 1:]]
+    rng.shuffle(rules)
+    updates = []
+    for _ in range(size):
+        update = rng.sample(pages, rng.choice(range(5, 24, 2)))
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(','.join(map(str, update)))
+    return '\n'.join(rules) + '\n\n' + '\n'.join(updates) + '\n', {}
+
+def _guard_exits(grid: List[List[str]], i: int, j: int) -> bool:
+    n, m = len(grid), len(grid[0])
+    d = 0
+    seen = set()
+    while (i, j, d) not in seen:
+        seen.add((i, j, d))
+        _i, _j = i + DIRECTIONS[d][0], j + DIRECTIONS[d][1]
+        if not (0 <= _i < n and 0 <= _j < m):
+            return True
+        if grid[_i][_j] == '#':
+            d = (d + 1) % 4
+        else:
+            i, j = _i, _j
+    return False
+
+def generate_day6(size: int, rng: random.Random) -> Generated:
+    """
+    A size x size lab map with sparse obstructions, and a guard whose patrol
+    leaves the map.
+    """
+    while True:
+        grid = [['#' if rng.random() < 0.02 else '.' for _ in range(size)] for _ in range(size)]
+        i, j = rng.randrange(size), rng.randrange(size)
+        grid[i][j] = '^'
+        if _guard_exits(grid, i, j):
+            return _grid_str(grid), {}
+
+def generate_day7(size: int, rng: random.Random) -> Generated:
+    """
+    size calibration equations of 3-12 inputs, of which roughly half are
+    solvable with "+", "*" and "||".
+    """
+    equations = []
+    for _ in range(size):
+        inputs = [rng.randint(1, 99) for _ in range(rng.randint(3, 12))]
+        target = inputs[0]
+        for n in inputs[1:]:
+            op = rng.choice('+*|') if target < 10 ** 12 else '+'
+            target = target + n if op == '+' else target * n if op == '*' else int(f'{target}{n}')
+        if rng.random() < 0.5:
+            target += rng.randint(1, 9)
+        equations.append(f'{target}: ' + ' '.join(map(str, inputs)))
+    return '\n'.join(equations) + '\n', {}
+
+def generate_day8(size: int, rng: random.Random) -> Generated:
+    """
+    A size x size map with sparse antennas of 62 possible frequencies.
+    """
+    frequencies = string.ascii_letters + string.digits
+    grid = [[rng.choice(frequencies) if rng.random() < 0.01 else '.' for _ in range(size)]
+            for _ in range(size)]
+    return _grid_str(grid), {}
+
+def generate_day9(size: int, rng: random.Random) -> Generated:
+    """
+    A disk map of size digits (rounded up to an odd number).
+    """
+    digits = [rng.randint(1, 9) if i % 2 == 0 else rng.randint(0, 9) for i in range(size | 1)]
+    return ''.join(map(str, digits)) + '\n', {}
+
+def generate_day10(size: int, rng: random.Random) -> Generated:
+    """
+    A size x size topographic map of diagonal slopes with random noise, so that
+    many hiking trails exist.
+    """
+    grid = [[str((i + j) % 10 if rng.random() > 0.2 else rng.randint(0, 9)) for j in range(size)]
+            for i in range(size)]
+    return _grid_str(grid), {}
+
+def generate_day11(size: int, rng: random.Random) -> Generated:
+    """
+    size stones engraved with random numbers.
+    """
+    return ' '.join(str(rng.randint(0, 10 ** rng.randint(1, 7))) for _ in range(size)), {}
+
+def generate_day12(size: int, rng: random.Random) -> Generated:
+    """
+    A size x size garden of blocky regions of 26 plant types, with noise.
+    """
+    blocks = [[rng.choice(string.ascii_uppercase) for _ in range(size // 4 + 1)]
+              for _ in range(size // 4 + 1)]
+    grid = [[blocks[i // 4][j // 4] if rng.random() > 0.1 else rng.choice(string.ascii_uppercase)
+             for j in range(size)] for i in range(size)]
+    return _grid_str(grid), {}
+
+def generate_day13(size: int, rng: random.Random) -> Generated:
+    """
+    size claw machines with linearly independent buttons, of which roughly half
+    have a reachable prize.
+    """
+    machines = []
+    while len(machines) < size:
+        ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+        if ax * by == ay * bx:
+            continue
+        n_a, n_b = rng.randint(0, 100), rng.randint(0, 100)
+        px, py = n_a * ax + n_b * bx, n_a * ay + n_b * by
+        if rng.random() < 0.5:
+            px += rng.randint(1, 9)
+        machines.append(f'Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\nPrize: X={px}, Y={py}')
+    return '\n\n'.join(machines) + '\n', {}
+
+def generate_day14(size: int, rng: random.Random) -> Generated:
+    """
+    About size robots with random velocities in a 101 x 103 space, positioned
+    so that at a random iteration as many robots as possible occupy distinct
+    positions. The number of robots is reduced so that part2 terminates.
+    """
+    mapsize = (101, 103)
+    cells = mapsize[0] * mapsize[1]
+
+    # NOTE: part2 searches for the first iteration with a coverage of at least
+    #  the maximum coverage rounded to 3 d.p., so it must not round upwards
+    while size < cells and round(size / cells, 3) > size / cells:
+        size -= 1
+    distinct = min(size, cells)
+    positions = rng.sample(range(cells), distinct)
+    positions += rng.choices(positions, k=size - distinct)
+
+    iters = rng.randint(1, 9999)
+    robots = []
+    for p in positions:
+        v_x, v_y = rng.randint(-99, 99), rng.randint(-99, 99)
+        x = (p % mapsize[0] - v_x * iters) % mapsize[0]
+        y = (p // mapsize[0] - v_y * iters) % mapsize[1]
+        robots.append(f'p={x},{y} v={v_x},{v_y}')
+    return '\n'.join(robots) + '\n', {'mapsize': mapsize}
+
+def generate_day15(size: int, rng: random.Random) -> Generated:
+    """
+    A size x size walled warehouse with random walls and boxes, followed by
+    10 * size robot moves.
+    """
+    grid = [['#'] * size] + \
+           [['#'] + [rng.choices('.#O', (0.6, 0.1, 0.3))[0] for _ in range(size - 2)] + ['#']
+            for _ in range(size - 2)] + [['#'] * size]
+    grid[rng.randint(1, size - 2)][rng.randint(1, size - 2)] = '@'
+    moves = ''.join(rng.choices('^v<>', k=10 * size))
+    moves = '\n'.join(moves[i:i + 1000] for i in range(0, len(moves), 1000))
+    return _grid_str(grid) + '\n' + moves + '\n', {}
+
+def generate_day16(size: int, rng: random.Random) -> Generated:
+    """
+    A size x size maze (rounded up to an odd size) carved by randomised
+    depth-first search, with extra walls removed to create alternative paths.
+    """
+    size = size | 1
+    grid = [['#'] * size for _ in range(size)]
+    stack = [(size - 2, 1)]
+    grid[size - 2][1] = '.'
+    while stack:
+        i, j = stack[-1]
+        options = [(i + 2 * di, j + 2 * dj, i + di, j + dj) for di, dj in DIRECTIONS
+                   if 0 < i + 2 * di < size - 1 and 0 < j + 2 * dj < size - 1
+                   and grid[i + 2 * di][j + 2 * dj] == '#']
+        if not options:
+            stack.pop()
+            continue
+        _i, _j, wall_i, wall_j = rng.choice(options)
+        grid[_i][_j] = grid[wall_i][wall_j] = '.'
+        stack.append((_i, _j))
+    for _ in range(size * size // 20):
+        grid[rng.randint(1, size - 2)][rng.randint(1, size - 2)] = '.'
+    grid[size - 2][1] = 'S'
+    grid[1][size - 2] = 'E'
+    return _grid_str(grid), {}
+
+def generate_day17(size: int, rng: random.Random) -> Generated:
+    """
+    A program which outputs one octal digit per shift of register A, where
+    register A is a random number of 3 * size bits.
+    """
+    x, y = rng.randrange(8), rng.randrange(8)
+    program = [2, 4, 1, x, 7, 5, 1, y, 4, 0, 0, 3, 5, 5, 3, 0]
+    a = rng.getrandbits(3 * size) | 1 << (3 * size - 1)
+    text = f'Register A: {a}\nRegister B: 0\nRegister C: 0\n\nProgram: {",".join(map(str, program))}\n'
+    return text, {}
+
+def generate_day18(size: int, rng: random.Random) -> Generated:
+    """
+    Falling bytes in a size x size memory space, covering every cell except the
+    start and end, so that the exit is eventually cut off.
+    """
+    cells = [(x, y) for x in range(size) for y in range(size)][1:-1]
+    rng.shuffle(cells)
+    text = '\n'.join(f'{x},{y}' for x, y in cells) + '\n'
+    return text, {'map_size': (size, size), 'n_bytes': size * size // 5}
+
+def generate_day19(size: int, rng: random.Random) -> Generated:
+    """
+    size towels of 1-8 stripes, and size // 2 designs of 20-60 stripes, most of
+    which are built from the towels.
+    """
+    towels = sorted({''.join(rng.choices('wubrg', k=rng.randint(1, 8))) for _ in range(size)})
+    patterns = []
+    for _ in range(max(1, size // 2)):
+        length = rng.randint(20, 60)
+        pattern = ''
+        while len(pattern) < length:
+            pattern += rng.choice(towels) if rng.random() > 0.02 else rng.choice('wubrg')
+        patterns.append(pattern)
+    return ', '.join(towels) + '\n\n' + '\n'.join(patterns), {}
+
+def generate_day23(size: int, rng: random.Random) -> Generated:
+    """
+    A random graph of size computers with an average degree of about 13, plus a
+    planted clique of 13 computers.
+    """
+    width = 2
+    while 26 ** width < size:
+        width += 1
+    names = set()
+    while len(names) < size:
+        names.add(''.join(rng.choices(string.ascii_lowercase, k=width)))
+    names = sorted(names)
+
+    edges = set()
+    for _ in range(size * 13 // 2):
+        a, b = rng.sample(names, 2)
+        edges.add((min(a, b), max(a, b)))
+    clique = rng.sample(names, min(13, size))
+    edges |= {(min(a, b), max(a, b)) for i, a in enumerate(clique) for b in clique[i + 1:]}
+    edges = [f'{a}-{b}' if rng.random() < 0.5 else f'{b}-{a}' for a, b in edges]
+    rng.shuffle(edges)
+    return '\n'.join(edges) + '\n', {}
+
+
+GENERATORS: Dict[int, Generator] = {
+    int(name[len('generate_day'):]): func
+    for name, func in list(globals().items()) if name.startswith('generate_day')
+}
+
+def generate(day: int, size: int, seed: Optional[int] = None) -> Generated:
+    """
+    Returns a generated input of the given size for the given day, and any
+    parameters (e.g. map size) which must be passed when loading it.
+    """
+    return GENERATORS[day](size, random.Random(seed))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('day', type=int, choices=sorted(GENERATORS))
+    parser.add_argument('-n', '--size', type=int, required=True)
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='output path (default: stdout)')
+    args = parser.parse_args(argv)
+
+    text, params = generate(args.day, args.size, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    if params:
+        print('params:', ' '.join(f'{k}={",".join(map(str, v)) if isinstance(v, tuple) else v}'
+                                  for k, v in params.items()), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
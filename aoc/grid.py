@@ -0,0 +1,141 @@
+"""Compact 2D grid of single-byte cells, shared by the grid-based days."""
+
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+OUTSIDE = 0  # Value of the padding cells around a grid
+
+CoordType = Tuple[int, int]
+
+
+class Grid:
+    """
+    A 2D grid of single-byte cells, stored row-major in a flat bytearray so
+    that each cell is addressed by a single integer index, and neighbouring
+    cells are found by adding precomputed offsets to an index.
+
+    A grid may be padded with a border of OUTSIDE cells, so that stepping off
+    the edge of the grid lands on a sentinel cell and no bounds checks are
+    required, provided no more than padding steps are taken at once.
+
+    Coordinates (i, j) are the row and column within the unpadded grid.
+    """
+
+    __slots__ = ('cells', 'height', 'width', 'padding', 'stride', 'steps', 'steps8')
+
+    def __init__(self, cells: bytearray, height: int, width: int, padding: int = 0) -> None:
+        self.cells = cells
+        self.height = height
+        self.width = width
+        self.padding = padding
+        self.stride = stride = width + 2 * padding
+
+        # Offsets to the orthogonal neighbours, clockwise from up (i.e. '^',
+        # '>', 'v', '<'), and to all eight neighbours, clockwise from up
+        self.steps = (-stride, 1, stride, -1)
+        self.steps8 = (-stride, -stride + 1, 1, stride + 1, stride, stride - 1, -1, -stride - 1)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], padding: int = 0) -> 'Grid':
+        """
+        Returns a grid of the characters in the given lines, ignoring trailing
+        newlines and blank lines, padded with the given number of cells.
+        """
+        rows = [row.rstrip('\n') for row in lines]
+        rows = [row for row in rows if row]
+        height, width = len(rows), len(rows[0])
+        pad = bytes([OUTSIDE]) * padding
+        border = bytes([OUTSIDE]) * ((width + 2 * padding) * padding)
+        cells = bytearray(border)
+        for row in rows:
+            cells += pad + row.encode() + pad
+        cells += border
+        return cls(cells, height, width, padding)
+
+    @classmethod
+    def filled(cls, height: int, width: int, value: int, padding: int = 0) -> 'Grid':
+        """
+        Returns a grid of the given size with every cell set to the given value.
+        """
+        stride = width + 2 * padding
+        cells = bytearray([OUTSIDE]) * (stride * (height + 2 * padding))
+        grid = cls(cells, height, width, padding)
+        for i in range(height):
+            start = grid.index(i, 0)
+            cells[start:start + width] = bytes([value]) * width
+        return grid
+
+    def index(self, i: int, j: int) -> int:
+        """
+        Returns the cell index of the given (row, column) coordinate.
+        """
+        return (i + self.padding) * self.stride + j + self.padding
+
+    def coords(self, idx: int) -> CoordType:
+        """
+        Returns the (row, column) coordinate of the given cell index.
+        """
+        i, j = divmod(idx, self.stride)
+        return i - self.padding, j - self.padding
+
+    def in_bounds(self, i: int, j: int) -> bool:
+        return 0 <= i < self.height and 0 <= j < self.width
+
+    def __getitem__(self, idx: int) -> int:
+        return self.cells[idx]
+
+    def __setitem__(self, idx: int, value: int) -> None:
+        self.cells[idx] = value
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def indices(self) -> Iterator[int]:
+        """
+        Returns an iterator over the indices of all (non-padding) cells, in
+        row-major order.
+        """
+        for i in range(self.height):
+            start = self.index(i, 0)
+            yield from range(start, start + self.width)
+
+    def find(self, value: int) -> Optional[int]:
+        """
+        Returns the index of the first cell with the given value, or None.
+        """
+        for idx in self.find_all(value):
+            return idx
+        return None
+
+    def find_all(self, value: int) -> Iterator[int]:
+        """
+        Returns an iterator over the indices of all cells with the given value.
+        """
+        idx = self.cells.find(value)
+        while idx != -1:
+            yield idx
+            idx = self.cells.find(value, idx + 1)
+
+    def copy(self) -> 'Grid':
+        return Grid(self.cells[:], self.height, self.width, self.padding)
+
+    def with_cell(self, idx: int, value: int) -> 'Grid':
+        """
+        Returns a copy of the grid with the value of the given cell replaced.
+        """
+        grid = self.copy()
+        grid.cells[idx] = value
+        return grid
+
+    def rows(self) -> List[str]:
+        """
+        Returns the (non-padding) cells of the grid as a list of strings.
+        """
+        rows = []
+        for i in range(self.height):
+            start = self.index(i, 0)
+            rows.append(self.cells[start:start + self.width].decode())
+        return rows
+
+    def __str__(self) -> str:
+        return '\n'.join(self.rows())
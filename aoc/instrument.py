@@ -0,0 +1,144 @@
+"""
+Instrumented runs recording wall time, memory and hot helper call counts.
+
+tracemalloc cannot count allocations which are freed again, so rather than a
+total allocation count, runs record the number of blocks allocated while
+solving which are still allocated when the solver returns (retained_blocks).
+"""
+
+import argparse
+import functools
+import sys
+import tracemalloc
+
+from collections import Counter
+from contextlib import contextmanager, redirect_stdout
+from time import perf_counter
+from types import ModuleType
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from aoc.days import DAYS, get_solver, load_args, load_module
+from aoc.run import parse_day, parse_param, to_json
+
+
+# Module-level helpers called in the inner loops of each day. Helpers must be
+# called through the module namespace (not a closure) for calls to be counted.
+HOT_HELPERS: Dict[int, List[str]] = {
+    4: ['word_search', 'count_overlapping', 'is_crossed'],
+    5: ['correctly_ordered', 'reorder'],
+    6: ['move_guard', 'has_loop'],
+    7: ['is_possible_equation'],
+    8: ['get_antinodes'],
+    9: ['write_filesystem'],
+    10: ['accessible_nodes'],
+    11: ['evolve', 'split'],
+    12: ['get_region', 'get_perimeter', 'get_sides'],
+    13: ['linsolve'],
+    14: ['evolve_map', 'coverage_ratio'],
+    15: ['move_robot'],
+    16: ['get_successors', 'get_predecessors'],
+    17: ['cmb'],
+    18: ['get_successors'],
+    19: ['recursive_search', 'counting_search'],
+    23: ['find_triads', 'find_maximal_cliques'],
+}
+
+
+@contextmanager
+def count_calls(mod: ModuleType, names: Iterable[str]) -> Iterator[Counter]:
+    """
+    Temporarily replaces the named functions in the given module with wrappers
+    counting the number of times each is called, including recursive calls.
+    Yields a counter of calls by function name.
+    """
+    counts = Counter()
+
+    def counted(name, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    originals = {name: getattr(mod, name) for name in names}
+    for name, func in originals.items():
+        setattr(mod, name, counted(name, func))
+    try:
+        yield counts
+    finally:
+        for name, func in originals.items():
+            setattr(mod, name, func)
+
+def instrument(day: int, part: int, path: Optional[str] = None, hot: Optional[List[str]] = None,
+        trace_memory: bool = True, **params) -> Dict[str, Any]:
+    """
+    Solves the given part as in aoc.run.run, additionally recording the peak
+    memory traced while solving, the number of memory blocks allocated by the
+    solver which are still allocated when it returns (e.g. the answer, and any
+    structures it keeps alive), and the number of calls to each hot helper.
+
+    Tracing memory and counting calls slows the solver down considerably, so
+    the wall time is only comparable between instrumented runs.
+    """
+    path = path or DAYS[day].input
+    hot = HOT_HELPERS.get(day, []) if hot is None else hot
+    record = {'day': day, 'part': part, 'input': path}
+    try:
+        mod = load_module(day)
+        solver = get_solver(mod, day, part)
+
+        t0 = perf_counter()
+        args = load_args(mod, day, part, path, **params)
+        t1 = perf_counter()
+
+        if trace_memory:
+            tracemalloc.start()
+        with count_calls(mod, hot) as calls, redirect_stdout(sys.stderr):
+            t2 = perf_counter()
+            answer = solver(*args)
+            t3 = perf_counter()
+        if trace_memory:
+            _, peak_memory = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            retained_blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+            tracemalloc.stop()
+
+    except Exception as e:
+        tracemalloc.stop()
+        record['error'] = f'{type(e).__name__}: {e}'
+        return record
+
+    record.update(answer=answer, parse_time=t1 - t0, wall_time=t3 - t2, calls=dict(calls))
+    if trace_memory:
+        record.update(peak_memory=peak_memory, retained_blocks=retained_blocks)
+    return record
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('days', nargs='*', type=parse_day,
+                        help='days to run (default: all)')
+    parser.add_argument('-p', '--part', nargs='+', type=int, default=[1, 2], dest='parts')
+    parser.add_argument('-i', '--input', help='input path, absolute or relative to the day directory')
+    parser.add_argument('--param', action='append', default=[], metavar='KEY=VALUE')
+    parser.add_argument('--hot', action='append', metavar='NAME',
+                        help='helper function to count calls to (default: per-day hot helpers)')
+    parser.add_argument('--no-memory', action='store_false', dest='trace_memory',
+                        help='do not trace memory allocations')
+    args = parser.parse_args(argv)
+    params = dict(parse_param(p) for p in args.param)
+
+    failed = False
+    for day in args.days or sorted(DAYS):
+        for part in args.parts:
+            if part not in DAYS[day].solvers:
+                continue
+            record = instrument(day, part, args.input, args.hot, args.trace_memory, **params)
+            failed |= 'error' in record
+            print(to_json(record), flush=True)
+
+    return int(failed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
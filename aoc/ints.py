@@ -0,0 +1,90 @@
+"""Bulk parser extracting every integer in an input in a single pass over its bytes."""
+
+import re
+
+from array import array
+from itertools import accumulate
+from typing import Iterator, Union
+
+
+NUMBER = re.compile(rb'-?\d+')
+
+# Every byte except the number marker and newline, for counting numbers per line
+_NOT_MARKER = bytes(b for b in range(256) if b not in b'#\n')
+
+
+class IntTable:
+    """
+    All of the (signed, 64-bit) integers in an input, stored in a flat array in
+    order of occurrence, with the offset into the array at which each line of
+    the input starts. Rows are returned as zero-copy memoryviews of the array.
+    """
+
+    __slots__ = ('values', 'offsets')
+
+    def __init__(self, values: array, offsets: array) -> None:
+        self.values = values
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def row(self, k: int) -> memoryview:
+        """
+        Returns the integers on the k-th line of the input.
+        """
+        return memoryview(self.values)[self.offsets[k]:self.offsets[k + 1]]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        view = memoryview(self.values)
+        for start, end in zip(self.offsets, self.offsets[1:]):
+            yield view[start:end]
+
+    def column(self, c: int, width: int) -> array:
+        """
+        Returns a copy of the c-th column of an input with width integers per
+        line, as an array.
+        """
+        return self.values[c::width]
+
+    def chunks(self, width: int) -> Iterator[memoryview]:
+        """
+        Returns consecutive groups of width integers, ignoring line breaks (e.g.
+        for records which span multiple lines).
+        """
+        view = memoryview(self.values)
+        for start in range(0, len(view) - width + 1, width):
+            yield view[start:start + width]
+
+    def __getstate__(self):
+        return self.values, self.offsets
+
+    def __setstate__(self, state):
+        self.values, self.offsets = state
+
+
+def parse_ints(data: Union[bytes, str]) -> IntTable:
+    """
+    Extracts every integer in the given data, along with the offset of each
+    line, without creating a string per line. A trailing newline does not
+    start an extra (empty) line; blank lines elsewhere are empty rows.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    values = array('q', map(int, NUMBER.findall(data)))
+
+    # Replace each number with a single marker byte and delete everything else
+    # but newlines, so the length of each line is its count of numbers
+    markers = NUMBER.sub(b'#', data).translate(None, _NOT_MARKER)
+    lines = markers.split(b'\n')
+    if data.endswith(b'\n'):
+        lines.pop()
+    offsets = array('q', accumulate(map(len, lines), initial=0))
+    return IntTable(values, offsets)
+
+def read_ints(path: str) -> IntTable:
+    """
+    Reads the file at the given path and extracts every integer it contains.
+    """
+    with open(path, 'rb') as f:
+        return parse_ints(f.read())
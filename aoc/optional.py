@@ -0,0 +1,39 @@
+"""Optional dependencies, imported only when first used."""
+
+import importlib.util
+import sys
+
+from types import ModuleType
+
+
+class MissingModule:
+    """
+    Stands in for an optional module which is not installed, raising the usual
+    ModuleNotFoundError when any of its attributes is used.
+    """
+
+    __slots__ = ('name',)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __getattr__(self, attr: str):
+        raise ModuleNotFoundError(f'No module named {self.name!r}', name=self.name)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Returns the named module, without executing it until one of its attributes
+    is first used. Modules binding an optional dependency at import time then
+    neither pay for importing it, nor fail without it, unless it is used.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if (spec := importlib.util.find_spec(name)) is None:
+        return MissingModule(name)
+
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,210 @@
+"""Profiles solvers, writing collapsed call stacks which flamegraph tools can read."""
+
+import argparse
+import sys
+import threading
+
+from collections import Counter
+from contextlib import redirect_stdout
+from pathlib import Path
+from time import perf_counter
+from types import CodeType, FrameType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aoc.cache import CACHE_DIR
+from aoc.days import DAYS, get_solver, load_args, load_module
+from aoc.run import parse_day, parse_param, to_json
+
+
+PROFILE_DIR = CACHE_DIR / 'profiles'
+
+
+def frame_label(module: str, qualname: str) -> str:
+    """
+    Returns the name of a function as it appears in a collapsed stack, e.g.
+    "day23.day23:find_maximal_cliques.<locals>.bron_kerbosch" for a closure.
+    """
+    return f'{module}:{qualname}'
+
+def collapse_recursion(labels: List[str]) -> List[str]:
+    """
+    Folds runs of directly recursive calls into a single frame, so that time
+    spent at every depth of a recursion is merged into one flamegraph bar.
+    """
+    return [label for k, label in enumerate(labels) if k == 0 or labels[k - 1] != label]
+
+def _stack_labels(frame: Optional[FrameType], root: FrameType, code: CodeType) -> List[str]:
+    # Walks from the innermost frame out to (but excluding) the root frame; the
+    # list is empty unless the outermost frame is running the given code, i.e.
+    # the root was not running the solver at the time
+    labels = []
+    while frame is not None and frame.f_back is not root:
+        labels.append(frame_label(frame.f_globals.get('__name__', '?'), frame.f_code.co_qualname))
+        frame = frame.f_back
+    if frame is None or frame.f_code is not code:
+        return []
+    labels.append(frame_label(frame.f_globals.get('__name__', '?'), code.co_qualname))
+    return labels[::-1]
+
+
+def sample(func: Callable, args: Tuple, interval: float = 0.001) -> Tuple[Any, Counter]:
+    """
+    Calls func(*args), while a background thread records the call stack of
+    the calling thread every interval seconds. Returns the result and the
+    number of samples of each stack (as a tuple of frame labels, outermost
+    first). Each frame of a recursion is a separate frame of the stack, so the
+    time spent at each depth is attributed to the right caller.
+    """
+    counts = Counter()
+    root = sys._getframe()
+    thread_id = threading.get_ident()
+    done = threading.Event()
+
+    def sampler():
+        while not done.wait(interval):
+            labels = _stack_labels(sys._current_frames().get(thread_id), root, func.__code__)
+            if labels:
+                counts[tuple(labels)] += 1
+
+    # The sampler can only run when the solver releases the interpreter lock,
+    # so switch threads at least as often as samples are due
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(min(switch_interval, interval))
+    thread = threading.Thread(target=sampler, daemon=True)
+    thread.start()
+    try:
+        result = func(*args)
+    finally:
+        done.set()
+        thread.join()
+        sys.setswitchinterval(switch_interval)
+    return result, counts
+
+def trace(func: Callable, args: Tuple) -> Tuple[Any, Counter]:
+    """
+    Calls func(*args) under a deterministic profiler, as cProfile does, but
+    records the time spent in each distinct call stack rather than in each
+    function, since per-function totals cannot be split between the depths of
+    a recursion. Returns the result and the self time of each stack in
+    microseconds. Much slower than sampling, but exact and needs no threads.
+    """
+    times = Counter()
+    stack = []  # [label, start time, time in callees] of each active call
+
+    def profiler(frame, event, arg):
+        now = perf_counter()
+        if event == 'call':
+            label = frame_label(frame.f_globals.get('__name__', '?'), frame.f_code.co_qualname)
+            stack.append([label, now, 0.0])
+        elif event == 'c_call':
+            label = frame_label(getattr(arg, '__module__', None) or 'builtins', arg.__qualname__)
+            stack.append([label, now, 0.0])
+        elif stack:  # 'return', 'c_return' or 'c_exception'
+            labels = tuple(entry[0] for entry in stack)
+            _, start, callees = stack.pop()
+            times[labels] += now - start - callees
+            if stack:
+                stack[-1][2] += now - start
+
+    sys.setprofile(profiler)
+    try:
+        result = func(*args)
+    finally:
+        sys.setprofile(None)
+    # Drop the call to sys.setprofile itself, which never returns while traced
+    times = Counter({labels: round(t * 1e6) for labels, t in times.items()
+                     if labels[0] != frame_label('sys', 'setprofile')})
+    return result, times
+
+def write_collapsed(counts: Counter, path: Path, fold_recursion: bool = False) -> None:
+    """
+    Writes stacks in the collapsed format read by flamegraph.pl, speedscope
+    and similar tools: one line per stack, of the frames separated by ";" then
+    a space and the count.
+    """
+    folded = Counter()
+    for labels, count in counts.items():
+        folded[tuple(collapse_recursion(list(labels)) if fold_recursion else labels)] += count
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        for labels, count in sorted(folded.items()):
+            if count > 0:
+                f.write(f'{";".join(labels)} {count}\n')
+
+def self_totals(counts: Counter, top: int = 5) -> Dict[str, int]:
+    """
+    Returns the functions with the highest counts at the top of the stack.
+    """
+    totals = Counter()
+    for labels, count in counts.items():
+        totals[labels[-1]] += count
+    return dict(totals.most_common(top))
+
+
+def profile(day: int, part: int, path: Optional[str] = None, mode: str = 'sample',
+        interval: float = 0.001, output: Path = PROFILE_DIR, fold_recursion: bool = False,
+        **params) -> Dict[str, Any]:
+    """
+    Solves the given part as in aoc.run.run under the given profiler mode
+    ('sample' or 'trace'), writing the collapsed stacks of the solver to the
+    output directory. Returns a record of the answer, wall time, total count
+    (samples, or microseconds when tracing) and the functions with the most
+    self time.
+    """
+    path = path or DAYS[day].input
+    record = {'day': day, 'part': part, 'input': path, 'mode': mode}
+    try:
+        mod = load_module(day)
+        solver = get_solver(mod, day, part)
+        args = load_args(mod, day, part, path, **params)
+
+        with redirect_stdout(sys.stderr):
+            t0 = perf_counter()
+            answer, counts = sample(solver, args, interval) if mode == 'sample' else trace(solver, args)
+            t1 = perf_counter()
+
+    except Exception as e:
+        record['error'] = f'{type(e).__name__}: {e}'
+        return record
+
+    out_path = output / f'day{day}-part{part}.folded'
+    write_collapsed(counts, out_path, fold_recursion)
+    record.update(answer=answer, wall_time=t1 - t0, total=sum(counts.values()),
+                  self_top=self_totals(counts), output=str(out_path))
+    return record
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('days', nargs='*', type=parse_day,
+                        help='days to run (default: all)')
+    parser.add_argument('-p', '--part', nargs='+', type=int, default=[1, 2], dest='parts')
+    parser.add_argument('-i', '--input', help='input path, absolute or relative to the day directory')
+    parser.add_argument('--param', action='append', default=[], metavar='KEY=VALUE')
+    parser.add_argument('--mode', choices=['sample', 'trace'], default='sample',
+                        help='sample stacks periodically, or trace every call (default: %(default)s)')
+    parser.add_argument('--interval', type=float, default=0.001,
+                        help='seconds between samples (default: %(default)s)')
+    parser.add_argument('-o', '--output', type=Path, default=PROFILE_DIR,
+                        help='directory to write collapsed stacks to (default: %(default)s)')
+    parser.add_argument('--fold-recursion', action='store_true',
+                        help='merge directly recursive calls into a single frame')
+    args = parser.parse_args(argv)
+    params = dict(parse_param(p) for p in args.param)
+
+    failed = False
+    for day in args.days or sorted(DAYS):
+        for part in args.parts:
+            if part not in DAYS[day].solvers:
+                continue
+            record = profile(day, part, args.input, args.mode, args.interval, args.output,
+                             args.fold_recursion, **params)
+            failed |= 'error' in record
+            print(to_json(record), flush=True)
+
+    return int(failed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""Runs selected days and parts, reporting parse and solve times as JSON lines."""
+
+import argparse
+import json
+import sys
+import traceback
+
+from contextlib import redirect_stdout
+from time import perf_counter
+from types import ModuleType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from aoc.cache import AnswerCache, ParseCache
+from aoc.days import DAYS, Alternative, Example, get_solver, load_args, load_module, resolve_input
+
+
+Job = Tuple[int, int, Optional[str], Dict[str, Any]]
+
+
+def run(day: int, part: int, path: Optional[str] = None, cache: Optional[AnswerCache] = None,
+        parse_cache: Optional[ParseCache] = None, **params) -> Dict[str, Any]:
+    """
+    Parses the input at the given path (defaulting to the day's real input) and
+    solves the given part. Returns a record of the answer and the time spent
+    parsing and solving, in seconds. Solver output is redirected to stderr.
+
+    If a cache is given and holds the answer for the same input and solver
+    code, the answer is returned from the cache along with the lookup time. If
+    a parse cache is given, the parsed input is loaded from it where possible.
+    """
+    path = path or DAYS[day].input
+    record = {'day': day, 'part': part, 'input': path, 'cached': False}
+    try:
+        mod = load_module(day)
+        solver = get_solver(mod, day, part)
+
+        if cache is not None:
+            t0 = perf_counter()
+            key = cache.key(mod, day, part, path, params)
+            hit, answer = cache.get(key)
+            if hit:
+                record.update(answer=answer, cached=True, lookup_time=perf_counter() - t0)
+                return record
+
+        t0 = perf_counter()
+        if parse_cache is not None:
+            args = cached_load_args(parse_cache, mod, day, part, path, **params)
+        else:
+            args = load_args(mod, day, part, path, **params)
+        t1 = perf_counter()
+        with redirect_stdout(sys.stderr):
+            answer = solver(*args)
+        t2 = perf_counter()
+
+    except Exception as e:
+        traceback.print_exc(file=sys.stderr)
+        record['error'] = f'{type(e).__name__}: {e}'
+        return record
+
+    if cache is not None:
+        cache.put(key, answer)
+    record.update(answer=answer, parse_time=t1 - t0, solve_time=t2 - t1)
+    return record
+
+def cached_load_args(parse_cache: ParseCache, mod: ModuleType, day: int, part: int, path: str,
+        **params) -> Tuple:
+    """
+    Returns the parsed arguments for the given input from the parse cache,
+    parsing the input and caching the result on a miss.
+    """
+    key = parse_cache.key(mod, day, part, path, params)
+    hit, args = parse_cache.get(key)
+    if not hit:
+        args = load_args(mod, day, part, path, **params)
+        # NOTE: cache before solving, as some solvers modify their arguments
+        parse_cache.put(key, args)
+    return args
+
+def iter_jobs(days: Iterable[int], parts: Iterable[int], path: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None, examples: bool = False) -> Iterator[Job]:
+    """
+    Yields (day, part, path, params) jobs for the given days and parts. If
+    examples is True, yields a job for every example with a known answer
+    instead of the real (or given) input.
+    """
+    for day in days:
+        spec = DAYS[day]
+        for part in parts:
+            if part not in spec.solvers:
+                continue
+            if not examples:
+                yield day, part, path, dict(params or {})
+                continue
+            for example in spec.examples:
+                if part in example.answers:
+                    yield day, part, example.filename, {**example.params, **(params or {})}
+
+def iter_alternatives(days: Iterable[int], parts: Iterable[int]
+        ) -> Iterator[Tuple[int, Alternative, Example]]:
+    """
+    Yields (day, alternative, example) for every alternative solver of the
+    given days and parts, and every example with a known answer for its part.
+    Solvers taking the input path read the whole file, so are only run on
+    examples loaded without parameters.
+    """
+    for day in days:
+        for alternative in DAYS[day].alternatives:
+            if alternative.part not in parts:
+                continue
+            for example in DAYS[day].examples:
+                if alternative.part in example.answers and \
+                        not (alternative.from_path and example.params):
+                    yield day, alternative, example
+
+def run_alternative(day: int, alternative: Alternative, example: Example) -> Dict[str, Any]:
+    """
+    Solves an example with an alternative solver, bypassing the caches, and
+    returns a record as in run, including whether the answer is the known one.
+    """
+    part = alternative.part
+    record = {'day': day, 'part': part, 'solver': alternative.solver, 'input': example.filename}
+    try:
+        mod = load_module(day)
+        solver = getattr(mod, alternative.solver)
+
+        t0 = perf_counter()
+        if alternative.from_path:
+            args = str(resolve_input(day, example.filename)),
+        else:
+            args = load_args(mod, day, part, example.filename, **example.params)
+        t1 = perf_counter()
+        with redirect_stdout(sys.stderr):
+            answer = solver(*args, **alternative.params)
+        t2 = perf_counter()
+
+    except Exception as e:
+        traceback.print_exc(file=sys.stderr)
+        record['error'] = f'{type(e).__name__}: {e}'
+        return record
+
+    record.update(answer=answer, parse_time=t1 - t0, solve_time=t2 - t1,
+                  ok=answer == example.answers[part])
+    return record
+
+def expected_answer(day: int, part: int, path: str) -> Any:
+    """
+    Returns the known answer to the given part for the given example file, or
+    None if the input is not a registered example.
+    """
+    for example in DAYS[day].examples:
+        if example.filename == path and part in example.answers:
+            return example.answers[part]
+    return None
+
+def parse_day(day: str) -> int:
+    """
+    Parses a day number given on the command line, rejecting days which are
+    not in the registry. This is the argument type rather than choices, since
+    argparse checks choices against the empty list when no days are given.
+    """
+    if (number := int(day)) not in DAYS:
+        raise argparse.ArgumentTypeError(
+            f'no day {day} (choose from {", ".join(map(str, sorted(DAYS)))})')
+    return number
+
+def parse_param(param: str) -> Tuple[str, Any]:
+    """
+    Parses a "key=value" command-line parameter, where the value is an integer
+    or a comma-separated tuple of integers.
+    """
+    key, value = param.split('=', 1)
+    values = tuple(int(v) for v in value.split(','))
+    return key, values[0] if len(values) == 1 else values
+
+def to_json(record: Dict[str, Any]) -> str:
+    """
+    Serialises a record as a single line of JSON.
+    """
+    return json.dumps(record, default=str)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('days', nargs='*', type=parse_day,
+                        help='days to run (default: all)')
+    parser.add_argument('-p', '--part', nargs='+', type=int, default=[1, 2], dest='parts')
+    parser.add_argument('-i', '--input', help='input path, absolute or relative to the day directory')
+    parser.add_argument('--param', action='append', default=[], metavar='KEY=VALUE',
+                        help='override a day parameter, e.g. mapsize=11,7')
+    parser.add_argument('--examples', action='store_true',
+                        help='run the examples and check the known answers, '
+                             'with the alternative solvers too')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='neither read nor write cached answers')
+    parser.add_argument('--cache-size', type=int, default=1024,
+                        help='maximum number of cached answers (default: %(default)s)')
+    parser.add_argument('--no-parse-cache', action='store_true',
+                        help='neither read nor write cached parsed inputs')
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = get_parser().parse_args(argv)
+    days = args.days or sorted(DAYS)
+    params = dict(parse_param(p) for p in args.param)
+    cache = None if args.no_cache else AnswerCache(max_entries=args.cache_size)
+    parse_cache = None if args.no_parse_cache else ParseCache()
+
+    failed = False
+    for day, part, path, job_params in iter_jobs(days, args.parts, args.input, params, args.examples):
+        record = run(day, part, path, cache, parse_cache, **job_params)
+        if args.examples and 'error' not in record:
+            record['ok'] = record['answer'] == expected_answer(day, part, path)
+        failed |= 'error' in record or not record.get('ok', True)
+        print(to_json(record), flush=True)
+
+    if args.examples:
+        for day, alternative, example in iter_alternatives(days, args.parts):
+            record = run_alternative(day, alternative, example)
+            failed |= 'error' in record or not record['ok']
+            print(to_json(record), flush=True)
+
+    return int(failed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
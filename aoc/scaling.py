@@ -0,0 +1,153 @@
+"""Measures how solvers scale on growing generated inputs, and fits growth exponents."""
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from contextlib import redirect_stdout
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from aoc.days import DAYS, get_solver, load_args, load_module
+from aoc.generate import GENERATORS, generate
+from aoc.run import to_json
+
+
+# Default (smallest, largest) sizes, in the units of each day's generator
+SIZE_RANGES: Dict[int, Tuple[int, int]] = {
+    1: (1000, 4096000), 2: (1000, 4096000), 3: (10000, 40960000), 4: (25, 3200),
+    5: (100, 409600), 6: (25, 1600), 7: (100, 102400), 8: (25, 3200),
+    9: (1000, 1024000), 10: (25, 3200), 11: (10, 40960), 12: (25, 1600),
+    13: (1000, 4096000), 14: (50, 51200), 15: (25, 1600), 16: (25, 1600),
+    17: (10, 10240), 18: (8, 1024), 19: (50, 51200), 23: (50, 51200),
+}
+
+
+def geometric_sizes(start: int, stop: int, factor: float = 2) -> List[int]:
+    """
+    Returns distinct sizes from start to at most stop, growing by the given
+    factor (so small factors may skip repeated sizes after rounding).
+    """
+    sizes = []
+    size = start
+    while size <= stop:
+        sizes.append(int(size))
+        size *= factor
+    return list(dict.fromkeys(sizes))
+
+def fit_exponent(xs: Sequence[float], ys: Sequence[float]) -> Optional[float]:
+    """
+    Returns the exponent k of the power law y = c * x^k best fitting the data,
+    by least squares regression in log-log space, or None if every x is equal.
+    """
+    log_xs = [math.log(x) for x in xs]
+    log_ys = [math.log(max(y, 1e-9)) for y in ys]
+    mean_x = sum(log_xs) / len(log_xs)
+    mean_y = sum(log_ys) / len(log_ys)
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(log_xs, log_ys))
+    var = sum((x - mean_x) ** 2 for x in log_xs)
+    return cov / var if var > 0 else None
+
+def measure(day: int, part: int, size: int, seed: int = 0, repeat: int = 1,
+        trace_memory: bool = True) -> Dict[str, Any]:
+    """
+    Solves the given part on a generated input of the given size, returning the
+    input length in bytes, the best solve time of the given number of repeats
+    and, if trace_memory is True, the peak memory traced in an additional run.
+    """
+    mod = load_module(day)
+    solver = get_solver(mod, day, part)
+    text, params = generate(day, size, seed)
+
+    fd, path = tempfile.mkstemp(prefix=f'day{day}-', suffix='.txt')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+
+        times = []
+        with redirect_stdout(sys.stderr):
+            for _ in range(repeat):
+                args = load_args(mod, day, part, path, **params)
+                t0 = perf_counter()
+                solver(*args)
+                times.append(perf_counter() - t0)
+
+            if trace_memory:
+                args = load_args(mod, day, part, path, **params)
+                tracemalloc.start()
+                try:
+                    solver(*args)
+                    _, peak_memory = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+    finally:
+        os.remove(path)
+
+    record = {'day': day, 'part': part, 'size': size, 'bytes': len(text), 'time': min(times)}
+    if trace_memory:
+        record['peak_memory'] = peak_memory
+    return record
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('day', type=int, choices=sorted(GENERATORS))
+    parser.add_argument('part', type=int, choices=[1, 2])
+    parser.add_argument('--sizes', type=int, nargs='+', help='explicit sizes to measure')
+    parser.add_argument('--start', type=int, help='smallest size (default: per day)')
+    parser.add_argument('--stop', type=int, help='largest size (default: per day)')
+    parser.add_argument('--factor', type=float, default=2)
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('-n', '--repeat', type=int, default=1)
+    parser.add_argument('--time-limit', type=float, default=10,
+                        help='stop growing once a solve takes this many seconds (default: %(default)s)')
+    parser.add_argument('--max-exponent', type=float, default=1.3,
+                        help='flag growth in time faster than bytes^k (default: %(default)s)')
+    parser.add_argument('--no-memory', action='store_false', dest='trace_memory',
+                        help='do not trace memory, which is much slower than solving')
+    args = parser.parse_args(argv)
+
+    if args.part not in DAYS[args.day].solvers:
+        parser.error(f'day {args.day} has no part {args.part}')
+    start, stop = SIZE_RANGES[args.day]
+    sizes = args.sizes or geometric_sizes(args.start or start, args.stop or stop, args.factor)
+
+    records = []
+    for size in sizes:
+        record = measure(args.day, args.part, size, args.seed, args.repeat, args.trace_memory)
+        records.append(record)
+        print(to_json(record), flush=True)
+        if record['time'] > args.time_limit:
+            break
+
+    # Generators may round sizes, so distinct sizes can give equal input
+    # lengths; fit only the first record of each length
+    fitted = {}
+    for record in records:
+        fitted.setdefault(record['bytes'], record)
+    records = list(fitted.values())
+    if len(records) < 2:
+        print('cannot fit an exponent: at least two distinct input lengths are needed',
+              file=sys.stderr)
+        return 1
+
+    bytes_ = [r['bytes'] for r in records]
+    summary = {
+        'day': args.day, 'part': args.part,
+        'time_exponent': fit_exponent(bytes_, [r['time'] for r in records]),
+    }
+    if args.trace_memory:
+        summary['memory_exponent'] = fit_exponent(bytes_, [r['peak_memory'] for r in records])
+    summary['flagged'] = summary['time_exponent'] > args.max_exponent
+    if summary['flagged']:
+        print(f'day {args.day} part {args.part}: time grows as bytes^{summary["time_exponent"]:.2f}',
+              file=sys.stderr)
+    print(to_json(summary), flush=True)
+    return int(summary['flagged'])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Runs parts in parallel, longest first according to previously recorded durations."""
+
+import json
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional
+
+from aoc.cache import CACHE_DIR, AnswerCache, ParseCache
+from aoc.days import DAYS
+from aoc.run import Job, expected_answer, get_parser, iter_jobs, parse_param, run, to_json
+
+
+HISTORY_PATH = CACHE_DIR / 'durations.json'
+
+
+def job_key(day: int, part: int, path: Optional[str]) -> str:
+    return f'{day}.{part}:{path or DAYS[day].input}'
+
+def load_history(path: Path = HISTORY_PATH) -> Dict[str, float]:
+    """
+    Returns the most recently recorded duration, in seconds, of each job.
+    """
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_history(history: Dict[str, float], path: Path = HISTORY_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+
+def longest_first(jobs: List[Job], history: Dict[str, float]) -> List[Job]:
+    """
+    Orders the jobs by decreasing recorded duration. Jobs without a recorded
+    duration are assumed to be long, and are ordered first.
+    """
+    return sorted(jobs, key=lambda job: -history.get(job_key(*job[:3]), float('inf')))
+
+def run_parallel(jobs: List[Job], workers: Optional[int] = None, history: Optional[Dict[str, float]] = None,
+        cache: Optional[AnswerCache] = None, parse_cache: Optional[ParseCache] = None
+        ) -> Iterator[Dict[str, Any]]:
+    """
+    Dispatches the jobs to a pool of worker processes, longest first, and
+    yields their records as they complete. The duration of each job which
+    was actually solved is written back to the history.
+    """
+    history = {} if history is None else history
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run, day, part, path, cache, parse_cache, **params)
+                   for day, part, path, params in longest_first(jobs, history)]
+        for future in as_completed(futures):
+            record = future.result()
+            if 'solve_time' in record:
+                key = job_key(record['day'], record['part'], record['input'])
+                history[key] = record['parse_time'] + record['solve_time']
+            yield record
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = get_parser()
+    parser.description = __doc__
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='number of worker processes (default: %(default)s)')
+    args = parser.parse_args(argv)
+    params = dict(parse_param(p) for p in args.param)
+    cache = None if args.no_cache else AnswerCache(max_entries=args.cache_size)
+    parse_cache = None if args.no_parse_cache else ParseCache()
+
+    jobs = list(iter_jobs(args.days or sorted(DAYS), args.parts, args.input, params, args.examples))
+    history = load_history()
+
+    failed = False
+    serial_time = 0.0
+    t0 = perf_counter()
+    for record in run_parallel(jobs, args.jobs, history, cache, parse_cache):
+        if args.examples and 'error' not in record:
+            record['ok'] = record['answer'] == expected_answer(record['day'], record['part'], record['input'])
+        failed |= 'error' in record or not record.get('ok', True)
+        serial_time += record.get('lookup_time', 0) + record.get('parse_time', 0) + record.get('solve_time', 0)
+        print(to_json(record), flush=True)
+    makespan = perf_counter() - t0
+
+    save_history(history)
+    print(to_json({'jobs': len(jobs), 'workers': args.jobs, 'makespan': makespan,
+                   'serial_time': serial_time, 'speedup': serial_time / makespan}), flush=True)
+    return int(failed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
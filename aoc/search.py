@@ -0,0 +1,164 @@
+"""Graph searches over integer-encoded states, shared by the search-based days."""
+
+import heapq
+
+from array import array
+from collections import deque
+from typing import Callable, Container, Iterable, List, Tuple
+
+
+UNREACHED = -1  # Distance (and parent) of states not yet reached by a search
+
+Successors = Callable[[int], Iterable[int]]
+WeightedSuccessors = Callable[[int], Iterable[Tuple[int, int]]]
+
+
+class Search:
+    """
+    Distance and parent tables for searches over the states 0..n_states-1 (e.g.
+    grid cell indices, or a cell index and direction packed into one integer),
+    stored in flat arrays rather than dicts.
+
+    Tables are kept between searches, so that a search does not revisit states
+    reached by an earlier one (e.g. to label the regions of a grid one at a
+    time), until reset. Resetting only clears the states that were reached, so
+    a single Search can be reused for many small searches over a large space.
+    """
+
+    __slots__ = ('dist', 'parent', 'touched')
+
+    def __init__(self, n_states: int) -> None:
+        self.dist = array('q', [UNREACHED]) * n_states
+        self.parent = array('q', [UNREACHED]) * n_states
+        self.touched = []
+
+    def reached(self, state: int) -> bool:
+        return self.dist[state] != UNREACHED
+
+    def reset(self) -> None:
+        """
+        Marks every state reached since the last reset as unreached.
+        """
+        dist, parent = self.dist, self.parent
+        for state in self.touched:
+            dist[state] = parent[state] = UNREACHED
+        self.touched.clear()
+
+    def path(self, state: int) -> List[int]:
+        """
+        Returns the states on the path found to the given state, starting from
+        the source it was reached from.
+        """
+        path = [state]
+        while (state := self.parent[state]) != UNREACHED:
+            path.append(state)
+        return path[::-1]
+
+    def _start(self, sources: Iterable[int]) -> List[int]:
+        started = []
+        for state in sources:
+            if self.dist[state] == UNREACHED:
+                self.dist[state] = 0
+                started.append(state)
+        self.touched += started
+        return started
+
+    def bfs(self, sources: Iterable[int], successors: Successors, goals: Container[int] = ()
+            ) -> List[int]:
+        """
+        Performs a breadth-first search from all of the given sources at once,
+        so the distance to each state is from its nearest source. Stops as soon
+        as any of the goals is reached.
+
+        Returns the states newly reached by this search, in the order they were
+        reached, ending with the goal if one was reached.
+        """
+        dist, parent = self.dist, self.parent
+        order = self._start(sources)
+        if any(state in goals for state in order):
+            return order
+
+        queue = deque(order)
+        while queue:
+            state = queue.popleft()
+            d = dist[state] + 1
+            for succ in successors(state):
+                if dist[succ] == UNREACHED:
+                    dist[succ] = d
+                    parent[succ] = state
+                    order.append(succ)
+                    self.touched.append(succ)
+                    if succ in goals:
+                        return order
+                    queue.append(succ)
+
+        return order
+
+    def dijkstra(self, sources: Iterable[int], successors: WeightedSuccessors,
+            goals: Container[int] = ()) -> List[int]:
+        """
+        Performs Dijkstra's algorithm from all of the given sources at once,
+        where successors returns (state, cost) pairs with non-negative costs.
+        Stops once any of the goals is settled.
+
+        Returns the states settled by this search, in order of distance, ending
+        with the goal if one was reached.
+        """
+        dist, parent = self.dist, self.parent
+        queue = [(0, state) for state in self._start(sources)]
+        heapq.heapify(queue)
+        order = []
+
+        while queue:
+            d, state = heapq.heappop(queue)
+            if d != dist[state]:
+                continue  # Superseded by a shorter path
+            order.append(state)
+            if state in goals:
+                break
+            for succ, cost in successors(state):
+                if dist[succ] == UNREACHED or d + cost < dist[succ]:
+                    if dist[succ] == UNREACHED:
+                        self.touched.append(succ)
+                    dist[succ] = d + cost
+                    parent[succ] = state
+                    heapq.heappush(queue, (d + cost, succ))
+
+        return order
+
+    def bucket_dijkstra(self, sources: Iterable[int], successors: WeightedSuccessors,
+            max_cost: int, goals: Container[int] = ()) -> List[int]:
+        """
+        Performs Dijkstra's algorithm as above, for integer costs of at most
+        max_cost, using a circular array of buckets indexed by distance in place
+        of a heap (Dial's algorithm), so each push and pop takes constant time.
+        """
+        dist, parent = self.dist, self.parent
+        n_buckets = max_cost + 1
+        buckets = [[] for _ in range(n_buckets)]
+        buckets[0] = self._start(sources)
+        pending = len(buckets[0])
+        order = []
+
+        d = 0
+        while pending:
+            bucket = buckets[d % n_buckets]
+            while bucket:
+                state = bucket.pop()
+                pending -= 1
+                if d != dist[state]:
+                    continue  # Superseded by a shorter path
+                order.append(state)
+                if state in goals:
+                    return order
+                for succ, cost in successors(state):
+                    if dist[succ] == UNREACHED or d + cost < dist[succ]:
+                        if dist[succ] == UNREACHED:
+                            self.touched.append(succ)
+                        dist[succ] = d + cost
+                        parent[succ] = state
+                        buckets[(d + cost) % n_buckets].append(succ)
+                        pending += 1
+            d += 1
+
+        return order
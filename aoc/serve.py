@@ -0,0 +1,169 @@
+"""Long-running local solver service, answering jobs from a pool of warm worker processes."""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import urllib.error
+import urllib.request
+
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from aoc.cache import AnswerCache
+from aoc.days import DAYS, load_module
+from aoc.run import run, to_json
+
+
+DEFAULT_PORT = 8024
+
+# Answer cache of each worker process, set by _warm_worker
+_cache: Optional[AnswerCache] = None
+
+
+def _warm_worker(use_cache: bool) -> None:
+    """
+    Imports every day's module (and the modules they import) once, when each
+    worker process starts, so that no job pays for imports.
+    """
+    global _cache
+    for day in DAYS:
+        load_module(day)
+    _cache = AnswerCache() if use_cache else None
+
+def solve_job(day: int, part: int, text: Optional[str] = None, path: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Solves a job in a worker process, as in aoc.run.run. The input is either
+    the given text, which is written to a temporary file for the parser, or
+    the input file at the given path (by default, the day's real input).
+    """
+    params = params or {}
+    if text is None:
+        return run(day, part, path, _cache, **params)
+
+    fd, tmp_path = tempfile.mkstemp(prefix=f'day{day}-', suffix='.txt')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        record = run(day, part, tmp_path, _cache, **params)
+    finally:
+        os.remove(tmp_path)
+    record['input'] = '<payload>'
+    return record
+
+
+class SolverHandler(BaseHTTPRequestHandler):
+    """
+    Handles "POST /solve" requests with a JSON body of the form {"day": 7,
+    "part": 2, "input": "...", "params": {...}}, where "input" (the puzzle
+    input text) may be replaced by "path" (an input file on the server) or
+    omitted for the day's real input. Responds with the record of the run,
+    plus the latency of the request in seconds, including time spent queued.
+
+    "GET /health" responds with the days served and the number of workers.
+    """
+
+    server: 'SolverServer'
+
+    def do_GET(self) -> None:
+        if self.path != '/health':
+            return self._respond(404, {'error': f'unknown path {self.path}'})
+        self._respond(200, {'days': sorted(DAYS), 'workers': self.server.workers})
+
+    def do_POST(self) -> None:
+        t0 = perf_counter()
+        if self.path != '/solve':
+            return self._respond(404, {'error': f'unknown path {self.path}'})
+        try:
+            job = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            day, part = int(job['day']), int(job['part'])
+        except (ValueError, KeyError, TypeError) as e:
+            return self._respond(400, {'error': f'invalid job: {type(e).__name__}: {e}'})
+        if day not in DAYS or part not in DAYS[day].solvers:
+            return self._respond(400, {'error': f'day {day} has no part {part}'})
+
+        future = self.server.executor.submit(
+            solve_job, day, part, job.get('input'), job.get('path'), job.get('params'))
+        record = future.result()
+        record['latency'] = perf_counter() - t0
+        print(to_json(record), file=sys.stderr, flush=True)
+        self._respond(500 if 'error' in record else 200, record)
+
+    def _respond(self, status: int, body: Dict[str, Any]) -> None:
+        payload = to_json(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # Each job is already logged as a JSON line
+
+
+class SolverServer(ThreadingHTTPServer):
+    """
+    An HTTP server handling each request in its own thread, which waits while
+    the job is solved in a pool of worker processes (so that CPU-bound solvers
+    run concurrently, rather than contending for one interpreter).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, workers: Optional[int] = None, use_cache: bool = True) -> None:
+        super().__init__(address, SolverHandler)
+        self.workers = workers or os.cpu_count()
+        self.executor = ProcessPoolExecutor(self.workers, initializer=_warm_worker,
+                                            initargs=(use_cache,))
+        # Start and warm every worker now, rather than on the first requests
+        for future in [self.executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(cancel_futures=True)
+
+
+def post_job(url: str, day: int, part: int, text: Optional[str] = None, path: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Sends a job to the service at the given URL (e.g. "http://127.0.0.1:8024")
+    and returns the record of the run, including failed runs.
+    """
+    job = {'day': day, 'part': part, 'input': text, 'path': path, 'params': params or {}}
+    request = urllib.request.Request(f'{url}/solve', data=json.dumps(job).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as e:
+        return json.load(e)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='number of worker processes (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='neither read nor write cached answers')
+    args = parser.parse_args(argv)
+
+    with SolverServer((args.host, args.port), args.jobs, not args.no_cache) as server:
+        print(f'serving {len(DAYS)} days on http://{args.host}:{server.server_port} '
+              f'with {server.workers} workers', file=sys.stderr, flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,22 @@
 """Day 1: Historian Hysteria"""
 
+import os
+import sys
+
+import heapq
+import tempfile
+
+from array import array
 from collections import Counter
-from typing import Iterable
+from itertools import groupby
+from typing import IO, Iterable, Iterator, List, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc.ints import read_ints
+from aoc.optional import lazy_import
+
+np = lazy_import('numpy')
 
 
 def part1(l1: Iterable[int], l2: Iterable[int]) -> int:
@@ -21,13 +36,175 @@ def part2(l1: Iterable[int], l2: Iterable[int]) -> int:
     return sum(n * counter[n] for n in l1)
 
 
+# Vectorised solvers, for inputs of millions of rows
+
+MAX_BINCOUNT_RANGE = 1 << 24  # Largest range of values counted with a dense table
+
+def as_int64(numbers: Iterable[int]):
+    """
+    Returns the given numbers as a NumPy int64 array, without copying if they
+    are already stored as 64-bit integers (e.g. an array('q') column).
+    """
+    return np.asarray(numbers if hasattr(numbers, '__len__') else list(numbers), dtype=np.int64)
+
+def load_columns(path: str):
+    """
+    Returns the two columns of the input at the given path as int64 arrays.
+    """
+    columns = np.frombuffer(read_ints(path).values, dtype=np.int64).reshape(-1, 2)
+    return columns[:, 0], columns[:, 1]
+
+def part1_numpy(l1: Iterable[int], l2: Iterable[int]) -> int:
+    """
+    Returns the same as part1, sorting and differencing the lists as arrays.
+    """
+    a1, a2 = np.sort(as_int64(l1)), np.sort(as_int64(l2))
+    return int(np.abs(a1 - a2).sum())
+
+def part2_numpy(l1: Iterable[int], l2: Iterable[int]) -> int:
+    """
+    Returns the same as part2, counting the numbers in l2 with a dense table
+    where their range is small enough, and otherwise by binary searching the
+    sorted unique numbers.
+    """
+    a1, a2 = as_int64(l1), as_int64(l2)
+    if len(a1) == 0 or len(a2) == 0:
+        return 0
+
+    lo, hi = int(a2.min()), int(a2.max())
+    if hi - lo < MAX_BINCOUNT_RANGE:
+        counts = np.bincount(a2 - lo, minlength=hi - lo + 1)
+        in_range = (a1 >= lo) & (a1 <= hi)
+        matches = np.zeros(len(a1), dtype=np.int64)
+        matches[in_range] = counts[a1[in_range] - lo]
+    else:
+        values, counts = np.unique(a2, return_counts=True)
+        idx = np.minimum(np.searchsorted(values, a1), len(values) - 1)
+        matches = np.where(values[idx] == a1, counts[idx], 0)
+
+    return int((a1 * matches).sum())
+
+
+# Out-of-core solvers, for lists too large to hold in memory: each column is
+# spilled to temporary files as sorted runs, which are merged back in order
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+def read_pairs(lines: Iterable[str]) -> Iterator[Tuple[int, int]]:
+    """
+    Yields the pair of numbers on each (non-blank) line, one line at a time.
+    """
+    for line in lines:
+        if line.strip():
+            n1, n2 = line.split()
+            yield int(n1), int(n2)
+
+def write_run(numbers: List[int], directory: str) -> str:
+    """
+    Sorts the numbers and writes them to a new binary file in the directory,
+    returning its path.
+    """
+    numbers.sort()
+    with tempfile.NamedTemporaryFile('wb', dir=directory, suffix='.run', delete=False) as f:
+        array('q', numbers).tofile(f)
+        return f.name
+
+def read_run(f: IO[bytes], buffer_size: int) -> Iterator[int]:
+    """
+    Yields the numbers in a sorted run file, reading buffer_size at a time.
+    """
+    while True:
+        buffer = array('q')
+        try:
+            buffer.fromfile(f, buffer_size)
+        except EOFError:  # Raised after reading the last, partial buffer
+            pass
+        if not buffer:
+            return
+        yield from buffer
+
+def sorted_columns(pairs: Iterable[Tuple[int, int]], directory: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[List[str], List[str]]:
+    """
+    Splits each column of the pairs into sorted runs of at most chunk_size
+    numbers, written to the directory. Returns the paths of the runs of each.
+    """
+    runs1, runs2 = [], []
+    chunk1, chunk2 = [], []
+    for n1, n2 in pairs:
+        chunk1.append(n1); chunk2.append(n2)
+        if len(chunk1) == chunk_size:
+            runs1.append(write_run(chunk1, directory)); chunk1 = []
+            runs2.append(write_run(chunk2, directory)); chunk2 = []
+    if chunk1:
+        runs1.append(write_run(chunk1, directory))
+        runs2.append(write_run(chunk2, directory))
+    return runs1, runs2
+
+def merge_runs(paths: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[int]:
+    """
+    Yields the numbers in all of the run files in sorted order (a k-way merge),
+    buffering at most chunk_size numbers in total.
+    """
+    files = [open(path, 'rb') for path in paths]
+    try:
+        buffer_size = max(1, chunk_size // max(1, len(files)))
+        yield from heapq.merge(*(read_run(f, buffer_size) for f in files))
+    finally:
+        for f in files:
+            f.close()
+
+def counted(numbers: Iterable[int]) -> Iterator[Tuple[int, int]]:
+    """
+    Yields each distinct number in a sorted stream and the number of times it
+    occurs.
+    """
+    for n, group in groupby(numbers):
+        yield n, sum(1 for _ in group)
+
+def similarity(sorted1: Iterable[int], sorted2: Iterable[int]) -> int:
+    """
+    Returns the similarity score of part2 from both lists in sorted order, by
+    joining the count of each number in either list, so that no count table
+    of all of the distinct numbers is held in memory.
+    """
+    score = 0
+    counts2 = counted(sorted2)
+    n2, count2 = next(counts2, (None, 0))
+    for n1, count1 in counted(sorted1):
+        while n2 is not None and n2 < n1:
+            n2, count2 = next(counts2, (None, 0))
+        if n2 == n1:
+            score += n1 * count1 * count2
+    return score
+
+def part1_external(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Returns the same as part1 for the input file at the given path, holding at
+    most (about) chunk_size numbers of each column in memory at once.
+    """
+    with open(path) as f, tempfile.TemporaryDirectory(prefix='day1-') as directory:
+        runs1, runs2 = sorted_columns(read_pairs(f), directory, chunk_size)
+        return sum(abs(n1 - n2) for n1, n2 in zip(merge_runs(runs1, chunk_size),
+                                                    merge_runs(runs2, chunk_size)))
+
+def part2_external(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Returns the same as part2 for the input file at the given path, holding at
+    most (about) chunk_size numbers of each column in memory at once.
+    """
+    with open(path) as f, tempfile.TemporaryDirectory(prefix='day1-') as directory:
+        runs1, runs2 = sorted_columns(read_pairs(f), directory, chunk_size)
+        return similarity(merge_runs(runs1, chunk_size), merge_runs(runs2, chunk_size))
+
+
 if __name__ == '__main__':
-    with open('example.txt') as f:
-        l1, l2 = list(zip(*[map(int, l.split()) for l in f.readlines()]))
+    numbers = read_ints('example.txt')
+    l1, l2 = numbers.column(0, 2), numbers.column(1, 2)
     assert (ans := part1(l1, l2)) == 11, ans
     assert (ans := part2(l1, l2)) == 31, ans
 
-    with open('input.txt') as f:
-        l1, l2 = list(zip(*[map(int, l.split()) for l in f.readlines()]))
+    numbers = read_ints('input.txt')
+    l1, l2 = numbers.column(0, 2), numbers.column(1, 2)
     print('Part 1:', part1(l1, l2))
     print('Part 2:', part2(l1, l2))
@@ -1,65 +1,48 @@
 """Day 12: Garden Groups"""
 
+import os
+import sys
+
 from collections import defaultdict
-from typing import List, Set, Tuple
+from typing import List, Optional, Set, Tuple
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-CoordType = Tuple[int, int]
+from aoc.grid import Grid
+from aoc.search import Search
 
-def pad(garden: List[str], c: str = '#') -> List[str]:
-    """
-    Pads the outside of the garden map with the given character.
-    """
-    m = len(garden[0])
-    return [c * (m + 2)] + [c + row + c for row in garden] + [c * (m + 2)]
+# A perimeter segment is the pair of cell indices (exterior, interior) which it
+# separates
+SegmentType = Tuple[int, int]
 
-def get_region(garden: List[str], start: CoordType) -> Set[CoordType]:
+
+def get_region(garden: Grid, start: int, search: Optional[Search] = None) -> Set[int]:
     """
-    Performs a BFS on the garden map from the starting position and returns
-    a set of all 4-connected coordinates with the same symbol as the start.
+    Performs a BFS on the garden map from the starting cell and returns a set
+    of the indices of all 4-connected cells with the same symbol as the start.
+    The garden must be padded.
+
+    Cells already reached by the given search (i.e. other regions) are not
+    searched again, so one search can be shared to find every region in turn.
     """
-    n, m = len(garden), len(garden[0])
-    i, j = start
-
-    region_symbol = garden[i][j]
-    region = {(i, j)}
-    queue = [(i, j)]
-
-    while len(queue) > 0:
-        _i, _j = queue.pop(0)
-
-        if _i > 0 and (garden[_i - 1][_j] == region_symbol) and ((_i - 1, _j) not in region):
-            queue.append((_i - 1, _j))
-            region.add((_i - 1, _j))
-        if _i < n - 1 and (garden[_i + 1][_j] == region_symbol) and ((_i + 1, _j) not in region):
-            queue.append((_i + 1, _j))
-            region.add((_i + 1, _j))
-        if _j > 0 and (garden[_i][_j - 1] == region_symbol) and ((_i, _j - 1) not in region):
-            queue.append((_i, _j - 1))
-            region.add((_i, _j - 1))
-        if _j < m - 1 and (garden[_i][_j + 1] == region_symbol) and ((_i, _j + 1) not in region):
-            queue.append((_i, _j + 1))
-            region.add((_i, _j + 1))
-
-    return region
-
-def get_perimeter(region: Set[CoordType]) -> List[Tuple[CoordType, CoordType]]:
+    search = search or Search(len(garden))
+    region_symbol = garden[start]
+    successors = lambda idx: [idx + step for step in garden.steps
+                              if garden[idx + step] == region_symbol]
+    return set(search.bfs([start], successors))
+
+def get_perimeter(garden: Grid, region: Set[int]) -> List[SegmentType]:
     """
     Returns the perimeter of the given region.
     """
     perimeter = []
-    for i, j in region:
-        if (_ij := (i - 1, j)) not in region:
-            perimeter.append((_ij, (i, j)))
-        if (_ij := (i + 1, j)) not in region:
-            perimeter.append((_ij, (i, j)))
-        if (_ij := (i, j - 1)) not in region:
-            perimeter.append((_ij, (i, j)))
-        if (_ij := (i, j + 1)) not in region:
-            perimeter.append((_ij, (i, j)))
+    for idx in region:
+        for step in garden.steps:
+            if (_idx := idx + step) not in region:
+                perimeter.append((_idx, idx))
     return perimeter
 
-def get_sides(region: Set[CoordType]) -> List[Set[CoordType]]:
+def get_sides(garden: Grid, region: Set[int]) -> List[Set[SegmentType]]:
     """
     Combines colinear perimeter segments into "sides", and returns the number of
     sides of the given region.
@@ -67,15 +50,14 @@ def get_sides(region: Set[CoordType]) -> List[Set[CoordType]]:
     sides = defaultdict(set)
     s_counter = 0
 
-    for (ext_i, ext_j), (int_i, int_j) in get_perimeter(region):
+    for ext, int_ in get_perimeter(garden, region):
         s1_idx = None; s2_idx = None
 
-        if ext_i == int_i: # i.e. vertical side
-            p1 = (ext_i - 1, ext_j), (int_i - 1, int_j)
-            p2 = (ext_i + 1, ext_j), (int_i + 1, int_j)
-        else: # i.e. horizontal side
-            p1 = (ext_i, ext_j - 1), (int_i, int_j - 1)
-            p2 = (ext_i, ext_j + 1), (int_i, int_j + 1)
+        # Neighbouring segments of a vertical side are in the rows above and
+        # below, and of a horizontal side in the columns to the left and right
+        step = garden.stride if abs(ext - int_) == 1 else 1
+        p1 = ext - step, int_ - step
+        p2 = ext + step, int_ + step
 
         for s_idx, s in sides.items():
             if s1_idx is None and p1 in s:
@@ -86,14 +68,14 @@ def get_sides(region: Set[CoordType]) -> List[Set[CoordType]]:
                 break
 
         if s1_idx is None and s2_idx is None:
-            sides[s_counter].add(((ext_i, ext_j), (int_i, int_j)))
+            sides[s_counter].add((ext, int_))
             s_counter += 1
         elif s1_idx is None:
-            sides[s2_idx].add(((ext_i, ext_j), (int_i, int_j)))
+            sides[s2_idx].add((ext, int_))
         elif s2_idx is None or s1_idx == s2_idx:
-            sides[s1_idx].add(((ext_i, ext_j), (int_i, int_j)))
+            sides[s1_idx].add((ext, int_))
         else: # s1_idx != s2_idx (and neither is None)
-            sides[s_counter] = sides[s1_idx] | sides[s2_idx] | {((ext_i, ext_j), (int_i, int_j))}
+            sides[s_counter] = sides[s1_idx] | sides[s2_idx] | {(ext, int_)}
             del sides[s1_idx]
             del sides[s2_idx]
             s_counter += 1
@@ -101,50 +83,45 @@ def get_sides(region: Set[CoordType]) -> List[Set[CoordType]]:
     return list(sides.values())
 
 
-def part1(garden: List[str]) -> int:
+def part1(garden: Grid) -> int:
     """
     Returns the sum of the cost of each distinct region in the given garden map,
     where the cost of a region is the product of its area and perimeter.
     """
-    visited = set()
+    search = Search(len(garden))
     total_cost = 0
 
-    for i, row in enumerate(garden):
-        for j in range(len(row)):
-            if (i, j) not in visited:
-                region = get_region(garden, (i, j))
-                total_cost += len(region) * len(get_perimeter(region))
-                visited |= region
+    for idx in garden.indices():
+        if not search.reached(idx):
+            region = get_region(garden, idx, search)
+            total_cost += len(region) * len(get_perimeter(garden, region))
 
     return total_cost
 
 
-def part2(garden: List[str]) -> int:
+def part2(garden: Grid) -> int:
     """
     Returns the sum of the cost of each distinct region in the given garden map,
     where the cost of the region is the product of its area and number of sides.
     """
-    padded = pad(garden)
-    visited = set()
+    search = Search(len(garden))
     total_cost = 0
 
-    for i in range(1, len(padded) - 1):
-        for j in range(1, len(padded[0]) - 1):
-            if (i, j) not in visited:
-                region = get_region(padded, (i, j))
-                total_cost += len(region) * len(get_sides(region))
-                visited |= region
+    for idx in garden.indices():
+        if not search.reached(idx):
+            region = get_region(garden, idx, search)
+            total_cost += len(region) * len(get_sides(garden, region))
 
     return total_cost
 
 
 if __name__ == '__main__':
     with open('example.txt') as f:
-        map = [row.strip() for row in f.readlines()]
+        map = Grid.from_lines(f.readlines(), padding=1)
     assert (ans := part1(map)) == 1930, ans
     assert (ans := part2(map)) == 1206, ans
 
     with open('input.txt') as f:
-        map = [row.strip() for row in f.readlines()]
+        map = Grid.from_lines(f.readlines(), padding=1)
     print('Part 1:', part1(map))
     print('Part 2:', part2(map))
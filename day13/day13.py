@@ -1,23 +1,23 @@
 """Day 13: Claw Contraption"""
 
-import re
+import os
+import sys
 
 from typing import List, Tuple
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def parse_machines(machine_str: str):
-    """"""
-    machine_str = machine_str.split('\n')
-    str2int = lambda t: (int(t[0]), int(t[1]))
-
-    p = re.compile(r'X\+(\d+), Y\+(\d+)')
-    button_a = str2int(re.findall(p, machine_str[0])[0])
-    button_b = str2int(re.findall(p, machine_str[1])[0])
+from aoc.ints import IntTable, read_ints
 
-    p = re.compile(r'X=(\d+), Y=(\d+)')
-    target = str2int(re.findall(p, machine_str[2])[0])
 
-    return button_a, button_b, target
+def parse_machines(numbers: IntTable) -> List[Tuple[Tuple[int, int], ...]]:
+    """
+    Returns the (X, Y) offsets of buttons A and B and the (X, Y) position of
+    the prize of each machine, given the six integers describing each machine
+    in order.
+    """
+    return [((a_x, a_y), (b_x, b_y), (z_x, z_y))
+            for a_x, a_y, b_x, b_y, z_x, z_y in numbers.chunks(6)]
 
 def linsolve(a: int, b: int, z: int) -> Tuple[int, int]:
     """"""
@@ -50,11 +50,9 @@ def part2(machines: List[Tuple[int, int, int]]) -> int:
 
 
 if __name__ == '__main__':
-    with open('example.txt') as f:
-        machines = [parse_machines(m) for m in f.read().split('\n\n')]
+    machines = parse_machines(read_ints('example.txt'))
     assert (ans := part1(machines)) == 480, ans
 
-    with open('input.txt') as f:
-        machines = [parse_machines(m) for m in f.read().split('\n\n')]
+    machines = parse_machines(read_ints('input.txt'))
     print('Part 1:', part1(machines))
     print('Part 2:', part2(machines))
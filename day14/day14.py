@@ -1,50 +1,65 @@
 """Day 14: Restroom Redoubt"""
 
-from collections import defaultdict
-from copy import deepcopy
-from typing import List, Tuple
+import os
+import sys
 
+from array import array
+from collections import Counter
+from typing import Tuple
 
-Robot = Tuple[Tuple[int, int], Tuple[int, int]]
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def parse_robot(robot_str: str) -> Robot:
+from aoc.ints import IntTable, read_ints
+
+
+class Robots:
+    """
+    The positions and velocities of a set of robots, stored as one array per
+    component (rather than a tuple per robot), so that the k-th robot is at
+    (x[k], y[k]) with velocity (v_x[k], v_y[k]).
+    """
+
+    __slots__ = ('x', 'y', 'v_x', 'v_y')
+
+    def __init__(self, x: array, y: array, v_x: array, v_y: array) -> None:
+        self.x = x
+        self.y = y
+        self.v_x = v_x
+        self.v_y = v_y
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+def parse_robots(numbers: IntTable) -> Robots:
     """
-    Parses a string representation of the position and velocity of a robot and
-    returns integer values in nested tuples.
+    Returns the positions and velocities of the robots, given the four integers
+    on each line of the input.
     """
-    pos_str, vel_str = robot_str.split()
-    x, y = pos_str[2:].split(',')
-    v_x, v_y = vel_str[2:].split(',')
-    return (int(x), int(y)), (int(v_x), int(v_y))
+    return Robots(*(numbers.column(c, 4) for c in range(4)))
 
-def evolve_map(robots: List[Robot], mapsize: Tuple[int, int], iters: int) -> List[Robot]:
+def evolve_map(robots: Robots, mapsize: Tuple[int, int], iters: int) -> Robots:
     """
     Returns the positions of each robot in the map of given size after the
     specified number of iterations.
     """
-    evolved = []
-
-    for (x, y), (v_x, v_y) in robots:
-        _x = (x + v_x * iters) % mapsize[0]
-        _y = (y + v_y * iters) % mapsize[1]
-        evolved.append(((_x, _y), (v_x, v_y)))
-
-    return evolved
+    width, height = mapsize
+    x = array('q', [(x + v_x * iters) % width for x, v_x in zip(robots.x, robots.v_x)])
+    y = array('q', [(y + v_y * iters) % height for y, v_y in zip(robots.y, robots.v_y)])
+    return Robots(x, y, robots.v_x, robots.v_y)
 
-def coverage_ratio(robots: List[Robot], mapsize: Tuple[int, int]) -> float:
+def coverage_ratio(robots: Robots, mapsize: Tuple[int, int]) -> float:
     """
     Returns the ratio of filled to unfilled positions in the map of given size.
     """
-    return len(set(p for p, _ in robots)) / (mapsize[0] * mapsize[1])
+    filled = {x * mapsize[1] + y for x, y in zip(robots.x, robots.y)}
+    return len(filled) / (mapsize[0] * mapsize[1])
 
 
-def draw_map(robots: List[Robot], mapsize: Tuple[int, int]) -> None:
+def draw_map(robots: Robots, mapsize: Tuple[int, int]) -> None:
     """
     Prints a visual representation of the robots in a map of the given size.
     """
-    positions = defaultdict(int)
-    for p, _ in robots:
-        positions[p] += 1
+    positions = Counter(zip(robots.x, robots.y))
 
     for y in range(mapsize[1]):
         for x in range(mapsize[0]):
@@ -52,7 +67,7 @@ def draw_map(robots: List[Robot], mapsize: Tuple[int, int]) -> None:
         print()
 
 
-def part1(robots: List[Robot], mapsize: Tuple[int, int]) -> int:
+def part1(robots: Robots, mapsize: Tuple[int, int]) -> int:
     """
     Returns the safety factor of the map, defined as the product of the number
     of robots in each of the 4 map quadrants, after 100 iterations.
@@ -62,7 +77,7 @@ def part1(robots: List[Robot], mapsize: Tuple[int, int]) -> int:
     # Count the number of robots in each quadrant
     quadrant = {'UL': 0, 'UR': 0, 'BL': 0, 'BR': 0}
 
-    for (x, y), _ in robots:
+    for x, y in zip(robots.x, robots.y):
         if x < mapsize[0] // 2:
             if y < mapsize[1] // 2:
                 quadrant['UL'] += 1
@@ -77,12 +92,12 @@ def part1(robots: List[Robot], mapsize: Tuple[int, int]) -> int:
     return quadrant['UL'] * quadrant['UR'] * quadrant['BL'] * quadrant['BR']
 
 
-def part2(robots: List[Robot], mapsize: Tuple[int, int]) -> int:
+def part2(robots: Robots, mapsize: Tuple[int, int]) -> int:
     """
     Returns the map iteration (up to a maximum value of 10000) with the maximum
     coverage ratio, defined as the ratio of filled to total map positions.
     """
-    _robots = deepcopy(robots)
+    _robots = robots
     coverage_ratios = []
     for _ in range(10000):
         _robots = evolve_map(_robots, mapsize, iters=1)
@@ -98,11 +113,9 @@ def part2(robots: List[Robot], mapsize: Tuple[int, int]) -> int:
 
 
 if __name__ == '__main__':
-    with open('example.txt') as f:
-        robots = [parse_robot(r) for r in f.readlines()]
+    robots = parse_robots(read_ints('example.txt'))
     assert (ans := part1(robots, (11, 7))) == 12, ans
 
-    with open('input.txt') as f:
-        robots = [parse_robot(r) for r in f.readlines()]
+    robots = parse_robots(read_ints('input.txt'))
     print('Part 1:', part1(robots, (101, 103)))
     print('Part 2:', part2(robots, (101, 103)))
@@ -1,111 +1,145 @@
 """Day 15: Warehouse Woes"""
 
-from typing import Dict, List, Set, Tuple
+import os
+import sys
 
+from array import array
+from typing import Tuple
 
-CoordType = Tuple[int, int]
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def parse_warehouse(warehouse_map: str, double_width: bool = False
-        ) -> Tuple[Set[CoordType], Dict[int, List[CoordType]], CoordType]:
+from aoc.grid import Grid
+from aoc.search import Search
+
+WALL = ord('#')
+NO_BOX = -1
+
+DIRECTIONS = '^>v<' # In the order of Grid.steps
+
+
+class Boxes:
     """
-    Parses a string representation of a warehouse map into a set of positions
-    representing walls, boxes and the robot. Each box has a unique ID number.
+    The positions of the boxes in a warehouse, as the cell index of the left
+    half of each box (by box ID), and the ID of the box occupying each cell of
+    the warehouse (or NO_BOX), both stored in arrays.
     """
-    walls = set()
-    boxes = dict()
-    robot = None, None
-    box_id = 0
-
-    for i, row in enumerate(warehouse_map.split('\n')):
-        for j, cell in enumerate(row):
-            if cell == '#':
-                walls |= {(i, 2 * j), (i, 2 * j + 1)} if double_width else {(i, j)}
-            elif cell == 'O':
-                boxes[box_id] = [(i, 2 * j), (i, 2 * j + 1)] if double_width else [(i, j)]
-                box_id += 1
-            elif cell == '@':
-                robot = (i, 2 * j) if double_width else (i, j)
-
-    return walls, boxes, robot
-
-def print_warehouse(walls: Set[CoordType], boxes: Dict[int, CoordType],
-        robot: CoordType, warehouse_size: Tuple[int, int]) -> None:
+
+    __slots__ = ('cells', 'width', 'lookup')
+
+    def __init__(self, cells: array, width: int, n_cells: int) -> None:
+        self.cells = cells
+        self.width = width
+        self.lookup = array('q', [NO_BOX]) * n_cells
+        for box_id, idx in enumerate(cells):
+            for k in range(width):
+                self.lookup[idx + k] = box_id
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def box_cells(self, box_id: int) -> range:
+        """
+        Returns the indices of the cells occupied by the given box.
+        """
+        return range(self.cells[box_id], self.cells[box_id] + self.width)
+
+    def move(self, box_id: int, step: int) -> None:
+        """
+        Moves the given box by the given cell offset.
+        """
+        # NOTE: delete all existing positions before writing any, else a newly
+        #  written position may be accidentally deleted
+        for idx in self.box_cells(box_id):
+            self.lookup[idx] = NO_BOX
+        self.cells[box_id] += step
+        for idx in self.box_cells(box_id):
+            self.lookup[idx] = box_id
+
+
+def parse_warehouse(warehouse_map: str, double_width: bool = False) -> Tuple[Grid, Boxes, int]:
     """
-    Prints a string representation of the warehouse map, for debugging.
+    Parses a string representation of a warehouse map into a grid of walls, and
+    the cell indices of the boxes and the robot. Each box has a unique ID number.
     """
-    for i in range(warehouse_size[0]):
-        for j in range(warehouse_size[1]):
-            if (i, j) in walls:
-                print('#', end='')
-            elif (i, j) in {p for ps in boxes.values() for p in ps}:
-                print('O', end='')
-            elif (i, j) == robot:
-                print('@', end='')
-            else:
-                print('.', end='')
-        print()
-    print()
+    rows = warehouse_map.strip().split('\n')
+    if double_width:
+        rows = [row.replace('#', '##').replace('O', '[]').replace('.', '..').replace('@', '@.')
+                for row in rows]
+    warehouse = Grid.from_lines(rows)
+
+    cells = array('q', warehouse.find_all(ord('[' if double_width else 'O')))
+    boxes = Boxes(cells, 2 if double_width else 1, len(warehouse))
+    robot = warehouse.find(ord('@'))
+
+    # Only the walls are stored in the grid; the boxes and robot move around
+    for idx in warehouse.indices():
+        if warehouse[idx] != WALL:
+            warehouse[idx] = ord('.')
+
+    return warehouse, boxes, robot
 
-def get_next_position(current_position: CoordType, direction: str) -> CoordType:
+def print_warehouse(warehouse: Grid, boxes: Boxes, robot: int) -> None:
     """
-    Returns the next position in the given direction from the current position.
+    Prints a string representation of the warehouse map, for debugging.
     """
-    i, j = current_position
-    next_i = {'^': i - 1, 'v': i + 1}.get(direction, i)
-    next_j = {'<': j - 1, '>': j + 1}.get(direction, j)
-    return next_i, next_j
+    warehouse = warehouse.copy()
+    for box_id in range(len(boxes)):
+        for idx in boxes.box_cells(box_id):
+            warehouse[idx] = ord('O')
+    warehouse[robot] = ord('@')
+    print(warehouse)
+    print()
 
-def move_robot(walls: Set[CoordType], boxes: Dict[int, List[CoordType]],
-        box_lookup: Dict[CoordType, int], robot: CoordType, direction: str) -> None:
+def move_robot(warehouse: Grid, boxes: Boxes, robot: int, step: int, search: Search) -> int:
     """
-    Updates the positions of the robot and boxes due to the given movement.
+    Updates the positions of the boxes due to the robot moving by the given
+    cell offset, and returns the new position of the robot. The search is
+    reset after use, so it can be shared between moves.
     """
-    # Use a queue to keep track of boxes affected by the move
-    check_queue = [get_next_position(robot, direction)]
-    box_queue = []
-    while len(check_queue) > 0:
-        check_p = check_queue.pop(0)
-        # If we run into a wall, the robot does not move
-        if check_p in walls:
-            return robot
-        if check_p in box_lookup:
-            if (box_id := box_lookup[check_p]) in box_queue:
-                continue
-            box_queue.append(box_id)
-            for box_p in boxes[box_id][::-1]:
-                check_queue.append(get_next_position(box_p, direction))
+    # Search for the cells which must be vacated for the move; a box in one of
+    # these cells must vacate the cells it is pushed into in turn
+    def successors(check_p):
+        if (box_id := boxes.lookup[check_p]) != NO_BOX:
+            return [box_p + step for box_p in reversed(boxes.box_cells(box_id))]
+        return []
+
+    affected = search.bfs([robot + step], successors)
+    search.reset()
+
+    # If we run into a wall, the robot does not move
+    if any(warehouse[check_p] == WALL for check_p in affected):
+        return robot
+    box_queue = list(dict.fromkeys(boxes.lookup[p] for p in affected if boxes.lookup[p] != NO_BOX))
 
     # Update the position of all the boxes affected by the move
     for box_id in box_queue[::-1]:
-        # NOTE: delete all existing positions before writing any, else a newly
-        #  written position may be accidentally deleted
-        for box_p in boxes[box_id]:
-            del box_lookup[box_p]
+        boxes.move(box_id, step)
 
-        new_positions = []
-        for box_p in boxes[box_id]:
-            new_positions.append(new_p := get_next_position(box_p, direction))
-            box_lookup[new_p] = box_id
-        boxes[box_id] = new_positions
+    return robot + step
 
-    return get_next_position(robot, direction)
+def simulate(warehouse: Grid, boxes: Boxes, robot: int, moves: str) -> int:
+    """
+    Simulates the movements of the robot, and returns the sum of the GPS
+    coordinates of the boxes after the robot has finished moving.
+    """
+    steps = dict(zip(DIRECTIONS, warehouse.steps))
+    search = Search(len(warehouse))
+    for move in moves:
+        if move in steps:
+            robot = move_robot(warehouse, boxes, robot, steps[move], search)
+    return sum(100 * i + j for i, j in map(warehouse.coords, boxes.cells))
 
 
-def part1(walls: Set[CoordType], boxes: Dict[int, CoordType], robot: CoordType,
-        moves: str) -> int:
+def part1(warehouse: Grid, boxes: Boxes, robot: int, moves: str) -> int:
     """
     Simulates the movements of the robot in a warehouse represented by the given
     walls and boxes. Returns a value representing the sum of the positions of
     the boxes after the robot has finished moving.
     """
-    box_lookup = {v[0]: k for k, v in boxes.items()}
-    for move in moves:
-        robot = move_robot(walls, boxes, box_lookup, robot, move)
-    return sum(100 * i + j for i, j in [p[0] for p in boxes.values()])
+    return simulate(warehouse, boxes, robot, moves)
 
 
-def part2(walls: Set[CoordType], boxes: Dict[int, CoordType], robot: CoordType,
-        moves: str) -> int:
+def part2(warehouse: Grid, boxes: Boxes, robot: int, moves: str) -> int:
     """
     Simulates the movements of a robot in a warehouse represented by the given
     walls and boxes. Compared to Part 1, boxes can now be half-aligned with
@@ -114,38 +148,30 @@ def part2(walls: Set[CoordType], boxes: Dict[int, CoordType], robot: CoordType,
     Returns a value representing the sum of the positions of the the boxes after
     the robot has finished moving.
     """
-    box_lookup = dict()
-    for box_id, (p1, p2) in boxes.items():
-        box_lookup[p1] = box_id
-        box_lookup[p2] = box_id
-
-    for move in moves:
-        robot = move_robot(walls, boxes, box_lookup, robot, move)
-
-    return sum(100 * i + j for i, j in [p[0] for p in boxes.values()])
+    return simulate(warehouse, boxes, robot, moves)
 
 
 if __name__ == '__main__':
     with open('example-part1-only.txt') as f:
         warehouse_map, moves = f.read().split('\n\n')
-        walls, boxes, robot = parse_warehouse(warehouse_map)
-    assert (ans := part1(walls, boxes, robot, moves)) == 2028, ans
+        warehouse, boxes, robot = parse_warehouse(warehouse_map)
+    assert (ans := part1(warehouse, boxes, robot, moves)) == 2028, ans
 
     with open('example-part2-only.txt') as f:
         warehouse_map, moves = f.read().split('\n\n')
-        walls, boxes, robot = parse_warehouse(warehouse_map, double_width=True)
-    assert (ans := part2(walls, boxes, robot, moves)) == 618, ans
+        warehouse, boxes, robot = parse_warehouse(warehouse_map, double_width=True)
+    assert (ans := part2(warehouse, boxes, robot, moves)) == 618, ans
 
     with open('example.txt') as f:
         warehouse_map, moves = f.read().split('\n\n')
-        walls, boxes, robot = parse_warehouse(warehouse_map)
-        assert (ans := part1(walls, boxes, robot, moves)) == 10092, ans
-        walls, boxes, robot = parse_warehouse(warehouse_map, double_width=True)
-        assert (ans := part2(walls, boxes, robot, moves)) == 9021, ans
+        warehouse, boxes, robot = parse_warehouse(warehouse_map)
+        assert (ans := part1(warehouse, boxes, robot, moves)) == 10092, ans
+        warehouse, boxes, robot = parse_warehouse(warehouse_map, double_width=True)
+        assert (ans := part2(warehouse, boxes, robot, moves)) == 9021, ans
 
     with open('input.txt') as f:
         warehouse_map, moves = f.read().split('\n\n')
-        walls, boxes, robot = parse_warehouse(warehouse_map)
-        print('Part 1:', part1(walls, boxes, robot, moves))
-        walls, boxes, robot = parse_warehouse(warehouse_map, double_width=True)
-        print('Part 2:', part2(walls, boxes, robot, moves))
+        warehouse, boxes, robot = parse_warehouse(warehouse_map)
+        print('Part 1:', part1(warehouse, boxes, robot, moves))
+        warehouse, boxes, robot = parse_warehouse(warehouse_map, double_width=True)
+        print('Part 2:', part2(warehouse, boxes, robot, moves))
@@ -1,137 +1,125 @@
 """Day 16: Reindeer Maze"""
 
-import heapq
+import os
+import sys
 
-from typing import List, Set, Tuple
+from typing import List, Tuple
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-NEXT_I = lambda i, direction: {'^': i - 1, 'v': i + 1}.get(direction, i)
-NEXT_J = lambda j, direction: {'<': j - 1, '>': j + 1}.get(direction, j)
-NEXT_P = lambda p, direction: (NEXT_I(p[0], direction), NEXT_J(p[1], direction))
+from aoc.grid import Grid
+from aoc.search import UNREACHED, Search
 
-CW  = lambda direction: {'^': '>', '>': 'v', 'v': '<', '<': '^'}[direction]
-CCW = lambda direction: {'^': '<', '<': 'v', 'v': '>', '>': '^'}[direction]
+# A node is a cell index in the maze and a direction, where the direction is an
+# index into Grid.steps (0: '^', 1: '>', 2: 'v', 3: '<'), packed into a single
+# integer state as cell * 4 + direction
+NodeType = int
 
-CoordType = Tuple[int, int]
+WALL = ord('#')
+NORTH, EAST = 0, 1
+TURN_COST = 1000
 
-def parse_input(lines: List[str]) -> Tuple[Set[CoordType], CoordType, CoordType]:
-    """
-    Parses a string representation of a maze into a set of walls, and start and
-    end coordinates.
-    """
-    walls = set(); start = None; end = None
+CW  = lambda direction: (direction + 1) % 4
+CCW = lambda direction: (direction + 3) % 4
 
-    for i, row in enumerate(lines):
-        for j, cell in enumerate(row):
-            if cell == '#':
-                walls.add((i, j))
-            elif cell == 'S':
-                start = (i, j)
-            elif cell == 'E':
-                end = (i, j)
 
-    return walls, start, end
+def parse_input(lines: List[str]) -> Tuple[Grid, int, int]:
+    """
+    Parses a string representation of a maze into a grid of walls, and start
+    and end cell indices.
+    """
+    maze = Grid.from_lines(lines)
+    start = maze.find(ord('S'))
+    end = maze.find(ord('E'))
+    return maze, start, end
 
-def get_successors(walls: Set[CoordType], score: int, node: Tuple[CoordType, str]
-        ) -> Set[CoordType]:
+def get_successors(maze: Grid, node: NodeType) -> List[Tuple[NodeType, int]]:
     """
-    Returns a set of all (coordinate, direction) pairs which can be reached from
-    the current position and direction. Does not return any pure rotations which
+    Returns a list of all (node, cost) pairs which can be reached from the
+    current position and direction. Does not return any pure rotations which
     cannot be immediately succeeded by a forward movement.
     """
-    position, direction = node
-    successors = set()
+    position, direction = divmod(node, 4)
+    successors = []
 
-    _i, _j  = NEXT_P(position, direction)
-    if (_i, _j) not in walls:
-        successors.add((score + 1, ((_i, _j), direction)))
+    if maze[position + maze.steps[direction]] != WALL:
+        successors.append((node + 4 * maze.steps[direction], 1))
 
-    _i, _j = NEXT_P(position, CW(direction))
-    if (_i, _j) not in walls:
-        successors.add((score + 1000, (position, CW(direction))))
+    if maze[position + maze.steps[CW(direction)]] != WALL:
+        successors.append((position * 4 + CW(direction), TURN_COST))
 
-    _i, _j = NEXT_P(position, CCW(direction))
-    if (_i, _j) not in walls:
-        successors.add((score + 1000, (position, CCW(direction))))
+    if maze[position + maze.steps[CCW(direction)]] != WALL:
+        successors.append((position * 4 + CCW(direction), TURN_COST))
 
     return successors
 
-
-def part1(walls: Set[CoordType], start: CoordType, end: CoordType) -> int:
+def get_predecessors(maze: Grid, node: NodeType) -> List[Tuple[NodeType, int]]:
     """
-    Performs a BFS on the maze from the starting position using a priority queue
-    and returns the minimum cost required to reach the end position.
+    Returns a list of all (node, cost) pairs from which the current position
+    and direction can be reached, i.e. the reverse of get_successors.
     """
-    queue = [(0, (start, '>'))]; heapq.heapify(queue)
-    visited = {(start, '>')}
+    position, direction = divmod(node, 4)
+    predecessors = []
 
-    while len(queue) > 0:
-        score, (position, direction) = heapq.heappop(queue)
-        if position == end:
-            break
+    if maze[position - maze.steps[direction]] != WALL:
+        predecessors.append((node - 4 * maze.steps[direction], 1))
 
-        for score, node in get_successors(walls, score, (position, direction)):
-            if node not in visited:
-                heapq.heappush(queue, (score, node))
-                visited.add(node)
+    if maze[position + maze.steps[direction]] != WALL:
+        predecessors.append((position * 4 + CCW(direction), TURN_COST))
+        predecessors.append((position * 4 + CW(direction), TURN_COST))
 
-    return score
+    return predecessors
 
 
-def part2(walls: Set[CoordType], start: CoordType, end: CoordType) -> int:
+def part1(maze: Grid, start: int, end: int) -> int:
+    """
+    Performs Dijkstra's algorithm on the maze from the starting position and
+    returns the minimum cost required to reach the end position.
+    """
+    search = Search(4 * len(maze))
+    ends = {end * 4 + direction for direction in range(4)}
+    settled = search.bucket_dijkstra([start * 4 + EAST], lambda node: get_successors(maze, node),
+                                     TURN_COST, goals=ends)
+    return search.dist[settled[-1]]
+
+
+def part2(maze: Grid, start: int, end: int) -> int:
     """
     Performs Dijkstra's algorithm from the starting position to find all lowest
     cost paths to the end position. Finds unique paths using a reverse search.
 
     Returns the number of cells which are part of at least one lowest cost path.
     """
-    best_score = part1(walls, start, end)
-
-    # Dijkstra's algorithm from start node, terminated early when costs exceed
-    # the known minimum cost to the end position. Instead of storing a single
-    # best parent, the algorithm is modified to store all equal best parents.
-    queue = [(0, (start, '>'))]
-    distances = {(start, '>'): (0, set())}
-
-    while len(queue) > 0:
-        score, (position, direction) = heapq.heappop(queue)
-        if score > best_score:
-            break
-
-        for score, node in get_successors(walls, score, (position, direction)):
-            if node not in distances or distances[node][0] > score:
-                heapq.heappush(queue, (score, node))
-                distances[node] = (score, {(position, direction)})
-
-            elif distances[node][0] == score:
-                heapq.heappush(queue, (score, node))
-                distances[node][1].add((position, direction))
+    search = Search(4 * len(maze))
+    search.bucket_dijkstra([start * 4 + EAST], lambda node: get_successors(maze, node), TURN_COST)
+    dist = search.dist
 
-    # Reverse path search from end position to start, counting distinct cells
-    rp_queue = [(end, direction) for direction in ('^', '>') if distances.get((end, direction), (0, None))[0] == best_score]
-    visited = set(rp_queue)
+    ends = [end * 4 + direction for direction in range(4) if dist[end * 4 + direction] != UNREACHED]
+    best_score = min(dist[node] for node in ends)
 
-    while len(rp_queue) > 0:
-        node = rp_queue.pop(0)
-        new_parents = [parent for parent in distances[node][1] if parent not in visited]
-        rp_queue += new_parents
-        visited |= set(new_parents)
+    # Reverse path search from end position to start, following every step
+    # which is part of a lowest cost path to the node it leads to
+    def parents(node):
+        return [parent for parent, cost in get_predecessors(maze, node)
+                if dist[parent] != UNREACHED and dist[parent] + cost == dist[node]]
 
-    return len({position for position, _ in visited})
+    on_path = Search(len(dist))
+    visited = on_path.bfs([node for node in ends if dist[node] == best_score], parents)
+    return len({node // 4 for node in visited})
 
 
 if __name__ == '__main__':
     with open('example-1.txt') as f:
-        walls, start, end = parse_input(f.readlines())
-    assert (ans := part1(walls, start, end)) == 7036, ans
-    assert (ans := part2(walls, start, end)) == 45, ans
+        maze, start, end = parse_input(f.readlines())
+    assert (ans := part1(maze, start, end)) == 7036, ans
+    assert (ans := part2(maze, start, end)) == 45, ans
 
     with open('example-2.txt') as f:
-        walls, start, end = parse_input(f.readlines())
-    assert (ans := part1(walls, start, end)) == 11048, ans
-    assert (ans := part2(walls, start, end)) == 64, ans
+        maze, start, end = parse_input(f.readlines())
+    assert (ans := part1(maze, start, end)) == 11048, ans
+    assert (ans := part2(maze, start, end)) == 64, ans
 
     with open('input.txt') as f:
-        walls, start, end = parse_input(f.readlines())
-    print('Part 1:', part1(walls, start, end))
-    print('Part 2:', part2(walls, start, end))
+        maze, start, end = parse_input(f.readlines())
+    print('Part 1:', part1(maze, start, end))
+    print('Part 2:', part2(maze, start, end))
@@ -1,75 +1,78 @@
 """Day 18: RAM Run"""
 
-from typing import List, Set, Tuple
+import os
+import sys
 
+from typing import Iterable, List, Optional, Tuple
 
-def parse_input(lines: List[str]) -> List[Tuple[int, int]]:
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc.grid import Grid
+from aoc.ints import IntTable, read_ints
+from aoc.search import Search
+
+SAFE = ord('.')
+CORRUPTED = ord('#')
+
+
+def parse_input(numbers: IntTable) -> List[Tuple[int, int]]:
+    """
+    Returns the coordinates on each line of the input as integer tuples.
+    """
+    return [(x, y) for x, y in numbers]
+
+def create_memory(map_size: Tuple[int, int], corrupted: Iterable[Tuple[int, int]]) -> Grid:
     """
-    Parses a list of coordinates in string representation into integer tuples.
+    Returns a padded grid of the given size, in which the given coordinates are
+    marked as "corrupted".
     """
-    return [tuple(map(int, line.strip().split(','))) for line in lines]
+    memory = Grid.filled(map_size[0], map_size[1], SAFE, padding=1)
+    for node in corrupted:
+        memory[memory.index(*node)] = CORRUPTED
+    return memory
 
-def get_successors(map_size: Tuple[int, int], corrupted: Set[Tuple[int, int]],
-               node: Tuple[int, int]) -> List[Tuple[int, int]]:
+def get_successors(memory: Grid, node: int) -> List[int]:
     """
     Returns the cells which can be reached from the given node. "Corrupted"
     cells cannot be traversed and are not included.
     """
-    successors = []
-
-    if node[0] > 0 and (s := (node[0] - 1, node[1])) not in corrupted:
-        successors.append(s)
-    if node[1] > 0 and (s := (node[0], node[1] - 1)) not in corrupted:
-        successors.append(s)
-    if node[0] < map_size[0] - 1 and (s := (node[0] + 1, node[1])) not in corrupted:
-        successors.append(s)
-    if node[1] < map_size[1] - 1 and (s := (node[0], node[1] + 1)) not in corrupted:
-        successors.append(s)
-
-    return successors
+    return [node + step for step in memory.steps if memory[node + step] == SAFE]
 
 
-def part1(map_size: Tuple[int, int], corrupted: Set[Tuple[int, int]]) -> int:
+def part1(memory: Grid, search: Optional[Search] = None) -> Optional[int]:
     """
-    Returns the shortest distance from the top left to the bottom right of a map
-    of the given size, where the "corrupted" cells cannot be traversed.
+    Returns the shortest distance from the top left to the bottom right of the
+    memory space, where the "corrupted" cells cannot be traversed. A search
+    over the memory space may be given to reuse; it is reset before returning.
     """
-    end = (map_size[0] - 1, map_size[1] - 1)
-    queue = [((0, 0), 0)]; visited = {(0, 0)}
+    start = memory.index(0, 0)
+    end = memory.index(memory.height - 1, memory.width - 1)
+    search = Search(len(memory)) if search is None else search
+    search.bfs([start], lambda node: get_successors(memory, node), goals=(end,))
+    dist = search.dist[end] if search.reached(end) else None
+    search.reset()
+    return dist
 
-    while len(queue) > 0:
-        node, distance = queue.pop(0)
-        for s in get_successors(map_size, corrupted, node):
-            if s == end:
-                return distance + 1
-            if s not in visited:
-                queue.append((s, distance + 1))
-                visited.add(s)
 
-    return None
-
-
-def part2(map_size: Tuple[int, int], corrupted: Set[Tuple[int, int]],
-          incoming: List[Tuple[int, int]]) -> Tuple[int, int]:
+def part2(memory: Grid, incoming: List[Tuple[int, int]]) -> Tuple[int, int]:
     """
     Returns the first incoming "corrupted" byte which blocks off the bottom
-    right corner of the map from the top left corner.
+    right corner of the memory space from the top left corner.
     """
+    search = Search(len(memory))
     for node in incoming:
-        corrupted.add(node)
-        if part1(map_size, corrupted) is None:
+        memory[memory.index(*node)] = CORRUPTED
+        if part1(memory, search) is None:
             return node
 
     raise RuntimeError('failed to converge')
 
 
 if __name__ == '__main__':
-    with open('example.txt') as f:
-        corrupted = parse_input(f.readlines())
-    assert (ans := part1((7, 7), set(corrupted[:12]))) == 22, ans
-    assert (ans := part2((7, 7), set(corrupted[:12]), corrupted[12:])) == (6, 1), ans
-
-    with open('input.txt') as f:
-        corrupted = parse_input(f.readlines())
-    print('Part 1:', part1((71, 71), set(corrupted[:1024])))
-    print('Part 2:', part2((71, 71), set(corrupted[:1024]), corrupted[1024:]))
+    corrupted = parse_input(read_ints('example.txt'))
+    assert (ans := part1(create_memory((7, 7), corrupted[:12]))) == 22, ans
+    assert (ans := part2(create_memory((7, 7), corrupted[:12]), corrupted[12:])) == (6, 1), ans
+
+    corrupted = parse_input(read_ints('input.txt'))
+    print('Part 1:', part1(create_memory((71, 71), corrupted[:1024])))
+    print('Part 2:', part2(create_memory((71, 71), corrupted[:1024]), corrupted[1024:]))
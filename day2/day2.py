@@ -1,30 +1,43 @@
 """Day 2: Red-Nosed Reports"""
 
+import os
+import sys
+
 from math import copysign
-from typing import List
+from typing import Iterable, Iterator, Optional, Sequence, Set, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc.ints import IntTable, read_ints
+from aoc.optional import lazy_import
 
+np = lazy_import('numpy')
 
-def is_safe(report: List[int], dampener: bool = False) -> bool:
+
+def is_safe(report: Sequence[int], dampener: bool = False) -> bool:
     """
     Returns True if the numbers in the report are either strictly increasing or
     strictly decreasing, with a maximum step change of 3 in either case.
 
     If dampener is True, up to one unsafe value may be discarded.
     """
+    if len(report) < 2:
+        return True
     sgn = copysign(1, report[1] - report[0])
     for i in range(1, len(report)):
         diff = report[i] - report[i - 1]
         if not (1 <= abs(diff) <= 3) or diff * sgn < 0:
             if dampener:
-                if i == len(report) - 1:
-                    return True
-                return is_safe([report[i - 1]] + report[i + 1:], dampener=False) or \
-                       is_safe([report[i - 2]] + report[i:],     dampener=False)
+                # Either level of the unsafe step may be discarded or, if the
+                # step is in the wrong direction, either of the first two
+                # levels (which set the direction)
+                return any(is_safe([*report[:k], *report[k + 1:]], dampener=False)
+                           for k in {0, 1, i - 1, i})
             return False
     return True
 
 
-def part1(reports: List[List[int]]) -> int:
+def part1(reports: Iterable[Sequence[int]]) -> int:
     """
     Returns the number of "safe" reports, defined as all numbers in the report
     being either strictly increasing or decreasing, and with a maximum step
@@ -33,7 +46,7 @@ def part1(reports: List[List[int]]) -> int:
     return sum(is_safe(report) for report in reports)
 
 
-def part2(reports: List[List[int]]) -> int:
+def part2(reports: Iterable[Sequence[int]]) -> int:
     """
     Returns the number of "safe" reports, defined the same way as in Part 1,
     except up to one unsafe value may be discarded and the report remains safe.
@@ -41,13 +54,139 @@ def part2(reports: List[List[int]]) -> int:
     return sum(is_safe(report, dampener=True) for report in reports)
 
 
+# Vectorised solvers, checking every report at once as a row of a 2D array
+
+def pad_reports(reports: IntTable):
+    """
+    Returns the reports as the rows of a 2D int64 array, padded with zeros to
+    the length of the longest report, and the length of each report.
+    """
+    values = np.frombuffer(reports.values, dtype=np.int64)
+    offsets = np.frombuffer(reports.offsets, dtype=np.int64)
+    lengths = np.diff(offsets)
+
+    matrix = np.zeros((len(lengths), lengths.max(initial=0)), dtype=np.int64)
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    cols = np.arange(len(values)) - np.repeat(offsets[:-1], lengths)
+    matrix[rows, cols] = values
+    return matrix, lengths
+
+def safe_rows(matrix, lengths):
+    """
+    Returns a boolean array of whether each row (of the given length) of the
+    padded array is safe, as defined by is_safe without the dampener.
+    """
+    diffs = np.diff(matrix, axis=1)
+    padding = np.arange(diffs.shape[1]) >= (lengths - 1)[:, None]
+    increasing = ((diffs >= 1) & (diffs <= 3)) | padding
+    decreasing = ((diffs <= -1) & (diffs >= -3)) | padding
+    return increasing.all(axis=1) | decreasing.all(axis=1)
+
+def safe_reports(reports: IntTable, dampener: bool = False):
+    """
+    Returns a boolean array of whether each report is safe, as defined by
+    is_safe. With the dampener, every report with each single level removed is
+    checked at once, one level position at a time.
+    """
+    matrix, lengths = pad_reports(reports)
+    safe = safe_rows(matrix, lengths)
+    if dampener:
+        # Only reports which are not already safe need rechecking
+        unsafe = np.flatnonzero(~safe)
+        matrix, lengths = matrix[unsafe], lengths[unsafe]
+        dampened = np.zeros(len(unsafe), dtype=bool)
+        for k in range(matrix.shape[1]):
+            has_level = k < lengths
+            dampened |= has_level & safe_rows(np.delete(matrix, k, axis=1), lengths - has_level)
+        safe[unsafe] = dampened
+    return safe
+
+def part1_numpy(reports: IntTable) -> int:
+    """
+    Returns the same as part1, checking all reports at once.
+    """
+    return int(safe_reports(reports).sum())
+
+def part2_numpy(reports: IntTable) -> int:
+    """
+    Returns the same as part2, checking all reports at once.
+    """
+    return int(safe_reports(reports, dampener=True).sum())
+
+
+# Streaming solvers, checking one report at a time in a single pass
+
+# The state of a pass over a report: the last level kept (None before the
+# first), the direction of the steps so far (0 before the first step), and the
+# number of levels discarded
+PassState = Tuple[Optional[int], int, int]
+
+def check_levels(levels: Iterable[int]) -> Tuple[bool, bool]:
+    """
+    Returns whether the report is safe without and with the dampener, as
+    defined by is_safe, in a single forward pass over its levels. Every way of
+    discarding up to one level is followed at once, without copying the report;
+    only a handful of distinct states can be live at any time.
+    """
+    states: Set[PassState] = {(None, 0, 0)}
+    for level in levels:
+        successors = set()
+        for last, direction, skips in states:
+            if skips == 0:
+                successors.add((last, direction, 1))  # Discard this level
+            if last is None:
+                successors.add((level, 0, skips))
+                continue
+            diff = level - last
+            if 1 <= abs(diff) <= 3 and diff * direction >= 0:
+                successors.add((level, 1 if diff > 0 else -1, skips))
+        if not (states := successors):
+            break
+    return any(skips == 0 for _, _, skips in states), len(states) > 0
+
+def stream_counts(lines: Iterable[str]) -> Iterator[Tuple[int, int]]:
+    """
+    Reads reports one line at a time from the given lines (e.g. an open file
+    or sys.stdin), and yields the running number of safe reports without and
+    with the dampener after each report.
+    """
+    n_safe = n_dampened = 0
+    for line in lines:
+        # A blank line is an empty report, as in read_ints, which is safe
+        safe, dampened = check_levels(map(int, line.split()))
+        n_safe += safe
+        n_dampened += dampened
+        yield n_safe, n_dampened
+
+def count_stream(lines: Iterable[str]) -> Tuple[int, int]:
+    """
+    Returns the number of safe reports without and with the dampener.
+    """
+    counts = (0, 0)
+    for counts in stream_counts(lines):
+        pass
+    return counts
+
+def part1_streaming(path: str) -> int:
+    """
+    Returns the same as part1 for the input file at the given path.
+    """
+    with open(path) as f:
+        return count_stream(f)[0]
+
+def part2_streaming(path: str) -> int:
+    """
+    Returns the same as part2 for the input file at the given path.
+    """
+    with open(path) as f:
+        return count_stream(f)[1]
+
+
 if __name__ == '__main__':
-    with open('example.txt') as f:
-        reports = [list(map(int, report.split())) for report in f.readlines()]
+    reports = read_ints('example.txt')
     assert (ans := part1(reports)) == 2, ans
     assert (ans := part2(reports)) == 4, ans
 
-    with open('input.txt') as f:
-        reports = [list(map(int, report.split())) for report in f.readlines()]
+    reports = read_ints('input.txt')
     print('Part 1:', part1(reports))
     print('Part 2:', part2(reports))
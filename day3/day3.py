@@ -1,7 +1,14 @@
 """Day 3: Mull It Over"""
 
+import mmap
+import os
 import re
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import chain
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
 
 def part1(memstr: str) -> int:
     """
@@ -36,6 +43,163 @@ def part2(memstr: str) -> int:
     return xsum
 
 
+# Streaming solvers, scanning a file in fixed-size chunks
+
+DEFAULT_CHUNK_SIZE = 1 << 24
+
+INSTRUCTION = re.compile(rb"mul\((\d+),(\d+)\)|do\(\)|don't\(\)")
+
+# An instruction cut short by the end of a chunk. Instructions contain an "m" or
+# a "d" only as their first character, so one can only be cut short if it
+# starts at the last "m" or "d" of the chunk.
+PARTIAL = re.compile(rb"m(?:u(?:l(?:\((?:\d+(?:,\d*)?)?)?)?)?|d(?:o(?:\(|n(?:'(?:t\(?)?)?)?)?")
+
+def partial_start(buffer: bytes, start: int = 0, end: Optional[int] = None) -> int:
+    """
+    Returns the position at which an instruction may have been cut short by
+    the end of the buffer (or of buffer[start:end]), or the end if there is
+    none.
+    """
+    end = len(buffer) if end is None else end
+    candidates = [buffer.rfind(b'm', start, end), buffer.rfind(b'd', start, end)]
+    cut = end
+    for pos in candidates:
+        if pos >= 0 and PARTIAL.fullmatch(buffer, pos, end):
+            cut = min(cut, pos)
+    return cut
+
+def scan_chunks(chunks: Iterable[bytes]) -> Tuple[int, int]:
+    """
+    Returns the sums of Part 1 and Part 2 over the concatenated chunks. Any
+    instruction straddling the end of a chunk is carried over and completed
+    with the start of the next one, as is whether "mul" is enabled.
+    """
+    xsum = enabled_sum = 0
+    enabled = True
+    carry = b''
+
+    for chunk in chunks:
+        buffer = carry + chunk
+        cut = partial_start(buffer)
+        for m in INSTRUCTION.finditer(buffer, 0, cut):
+            if m[1] is not None:
+                product = int(m[1]) * int(m[2])
+                xsum += product
+                if enabled:
+                    enabled_sum += product
+            else:
+                enabled = m[0] == b'do()'
+        carry = buffer[cut:]
+
+    # What remains can only be an incomplete instruction
+    return xsum, enabled_sum
+
+def read_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yields the contents of the file at the given path in chunks of the given
+    size, read through a memory map so only the current chunk is copied.
+    """
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return  # Empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, len(mm), chunk_size):
+                yield mm[start:start + chunk_size]
+
+def part1_mmap(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Returns the same as part1 for the contents of the file at the given path.
+    """
+    return scan_chunks(read_chunks(path, chunk_size))[0]
+
+def part2_mmap(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Returns the same as part2 for the contents of the file at the given path.
+    """
+    return scan_chunks(read_chunks(path, chunk_size))[1]
+
+
+# Parallel solvers. A chunk is summarised by its sums when entered enabled and
+# when entered disabled, so chunks are scanned independently and then combined
+
+class Summary(NamedTuple):
+    total: int                  # Sum of all "mul" instructions (Part 1)
+    if_enabled: int             # Sum of enabled "mul" if entered enabled
+    if_disabled: int            # Sum of enabled "mul" if entered disabled
+    final: Optional[bool]       # State set by the last do/don't, if any
+
+EMPTY_SUMMARY = Summary(0, 0, 0, None)
+
+def combine(a: Summary, b: Summary) -> Summary:
+    """
+    Returns the summary of chunk a followed by chunk b.
+    """
+    after_enabled = True if a.final is None else a.final
+    after_disabled = False if a.final is None else a.final
+    return Summary(
+        a.total + b.total,
+        a.if_enabled + (b.if_enabled if after_enabled else b.if_disabled),
+        a.if_disabled + (b.if_enabled if after_disabled else b.if_disabled),
+        a.final if b.final is None else b.final,
+    )
+
+def summarise_range(path: str, start: int, end: int) -> Summary:
+    """
+    Returns the summary of the instructions in the file at the given path
+    which start within [start, end). Only the range is scanned, except for an
+    instruction starting before the end but finishing after it, which belongs
+    to this range and is read in full.
+    """
+    total = if_enabled = if_disabled = 0
+    state = None
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        cut = partial_start(mm, start, end)
+        straddling = INSTRUCTION.match(mm, cut) if cut < end else None
+        matches = INSTRUCTION.finditer(mm, start, cut)
+        for m in chain(matches, [straddling] if straddling else []):
+            if m[1] is not None:
+                product = int(m[1]) * int(m[2])
+                total += product
+                if state is None or state:
+                    if_enabled += product
+                if state:
+                    if_disabled += product
+            else:
+                state = m[0] == b'do()'
+    return Summary(total, if_enabled, if_disabled, state)
+
+def solve_parallel(path: str, workers: Optional[int] = None, n_chunks: Optional[int] = None
+        ) -> Tuple[int, int]:
+    """
+    Returns the answers to Part 1 and Part 2 for the file at the given path,
+    summarising n_chunks ranges of the file (by default, four per worker) in
+    a pool of worker processes.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return 0, 0
+    workers = workers or os.cpu_count()
+    n_chunks = min(size, n_chunks or 4 * workers)
+    bounds = [size * k // n_chunks for k in range(n_chunks + 1)]
+
+    with ProcessPoolExecutor(workers) as executor:
+        summaries = executor.map(summarise_range, [path] * n_chunks, bounds[:-1], bounds[1:])
+        summary = reduce(combine, summaries, EMPTY_SUMMARY)
+    return summary.total, summary.if_enabled
+
+def part1_parallel(path: str, workers: Optional[int] = None) -> int:
+    """
+    Returns the same as part1 for the contents of the file at the given path.
+    """
+    return solve_parallel(path, workers)[0]
+
+def part2_parallel(path: str, workers: Optional[int] = None) -> int:
+    """
+    Returns the same as part2 for the contents of the file at the given path.
+    """
+    return solve_parallel(path, workers)[1]
+
+
 if __name__ == '__main__':
     with open('example.txt') as f:
         memstr = f.readlines()
@@ -1,91 +1,338 @@
 """Day 4: Ceres Search"""
 
-from typing import List
+import os
+import sys
 
+from collections import Counter, deque
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
-def cross_search(puzzle: List[str], i: int, j: int, dir: str, target: str = 'MAS') -> bool:
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc.grid import Grid
+from aoc.optional import lazy_import
+
+np = lazy_import('numpy')
+
+
+# Names of the directions of Grid.steps8, clockwise from up
+DIRECTIONS = ('N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW')
+
+# Letters at the ends of each diagonal of a crossed "MAS"
+CROSS_ENDS = {ord('M'), ord('S')}
+
+# Word lists at least this long are searched for with an automaton, rather than
+# one bytes.find scan per word and direction
+AUTOMATON_MIN_WORDS = 16
+
+# Each transition table maps a letter to the next state of the automaton
+Automaton = Tuple[List[Dict[int, int]], List[List[int]]]
+
+
+def build_automaton(patterns: List[bytes]) -> Automaton:
+    """
+    Returns an Aho-Corasick automaton matching all of the patterns at once, as
+    the transitions of each state for every letter in any pattern (letters not
+    in any pattern return to the initial state 0), and the indices of the
+    patterns which end at each state.
+    """
+    goto = [{}]
+    out = [[]]
+    for k, pattern in enumerate(patterns):
+        state = 0
+        for letter in pattern:
+            if letter not in goto[state]:
+                goto.append({})
+                out.append([])
+                goto[state][letter] = len(goto) - 1
+            state = goto[state][letter]
+        out[state].append(k)
+
+    # Breadth-first, complete the transitions of each state with those of its
+    # longest proper suffix which is also a state (its failure state)
+    alphabet = set(b''.join(patterns))
+    fail = [0] * len(goto)
+    delta = [dict(goto[0])]
+    delta.extend({} for _ in range(len(goto) - 1))
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        out[state] = out[state] + out[fail[state]]
+        for letter in alphabet:
+            if letter in goto[state]:
+                child = goto[state][letter]
+                fail[child] = delta[fail[state]].get(letter, 0) if state else 0
+                delta[state][letter] = child
+                queue.append(child)
+            elif (next_state := delta[fail[state]].get(letter, 0)):
+                delta[state][letter] = next_state
+    return delta, out
+
+def grid_lines(puzzle: Grid, step: int) -> Iterator[bytes]:
+    """
+    Returns every line of the puzzle in the direction of the given cell offset.
+    Lines are taken as slices of the cells with the step as stride, so more
+    than one line may be returned in each slice, separated by padding cells.
+    The puzzle must be padded by at least 1 cell.
+    """
+    cells = bytes(puzzle.cells)
+    for start in range(step):
+        yield cells[start::step]
+
+def count_overlapping(line: bytes, pattern: bytes) -> int:
+    """
+    Returns the number of occurrences of the pattern in the line, including
+    overlapping occurrences (which bytes.count does not count).
+    """
+    n = 0
+    idx = line.find(pattern)
+    while idx != -1:
+        n += 1
+        idx = line.find(pattern, idx + 1)
+    return n
+
+def word_search(puzzle: Grid, words: Iterable[str], automaton: Optional[bool] = None
+        ) -> Dict[str, Dict[str, int]]:
+    """
+    Returns the number of times each word occurs in the puzzle in each of the
+    8 cardinal and diagonal directions, counting overlapping occurrences.
+
+    Words are searched for in the lines of the puzzle in the directions E, SE,
+    S and SW, and reversed words find occurrences in the opposite directions.
+    Long word lists (or any, if automaton is True) are matched by a single
+    automaton, rather than scanning once per word. The puzzle must be padded
+    by at least 1 cell.
     """
-    Returns True if the letters starting from but not including the given
-    puzzle coordinates and in the given direction spell out the target word.
+    words = list(dict.fromkeys(word for word in words if word))
+    patterns = [word.encode() for word in words] + [word.encode()[::-1] for word in words]
+    if automaton is None:
+        automaton = len(words) >= AUTOMATON_MIN_WORDS
+    if automaton:
+        delta, out = build_automaton(patterns)
+
+    counts = {word: dict.fromkeys(DIRECTIONS, 0) for word in words}
+    for forward in (2, 3, 4, 5):  # E, SE, S, SW
+        backward = DIRECTIONS[(forward + 4) % 8]
+        lines = list(grid_lines(puzzle, puzzle.steps8[forward]))
+        if automaton:
+            found = Counter()
+            for line in lines:
+                state = 0
+                for letter in line:
+                    state = delta[state].get(letter, 0)
+                    if out[state]:
+                        found.update(out[state])
+        else:
+            found = {k: sum(count_overlapping(line, pattern) for line in lines)
+                     for k, pattern in enumerate(patterns)}
+        for k, n in found.items():
+            if k < len(words):
+                counts[words[k]][DIRECTIONS[forward]] += n
+            else:
+                counts[words[k - len(words)]][backward] += n
+    return counts
+
+def is_crossed(puzzle: Grid, idx: int) -> bool:
     """
-    inc_i = {'U': -1, 'UL': -1, 'L':  0, 'DL':  1, 'D': 1, 'DR': 1, 'R': 0, 'UR': -1}[dir]
-    inc_j = {'U':  0, 'UL': -1, 'L': -1, 'DL': -1, 'D': 0, 'DR': 1, 'R': 1, 'UR':  1}[dir]
-    for letter in target:
-        i += inc_i
-        j += inc_j
-        if puzzle[i][j] != letter:
-            return False
-    return True
+    Returns True if both diagonals through the given cell read "MAS" or "SAM".
+    The puzzle must be padded by at least 1 cell.
+    """
+    up_left, up_right = puzzle.steps8[7], puzzle.steps8[1]
+    return {puzzle[idx + up_left], puzzle[idx - up_left]} == CROSS_ENDS and \
+        {puzzle[idx + up_right], puzzle[idx - up_right]} == CROSS_ENDS
 
 
-def part1(puzzle: List[str]) -> int:
+def part1(puzzle: Grid) -> int:
     """
     Returns the number of "XMAS" strings in the puzzle, where the string may be
-    oriented in any of the 8 cardinal and diagonal directions.
-    """
-    n = len(puzzle)
-    m = len(puzzle[0])
-
-    matches = 0
-    for i, row in enumerate(puzzle):
-        for j, letter in enumerate(row):
-            if letter == 'X':
-                if i >= 3:
-                    matches += cross_search(puzzle, i, j, 'U')
-                    if j >= 3:
-                        matches += cross_search(puzzle, i, j, 'UL')
-                if j >= 3:
-                    matches += cross_search(puzzle, i, j, 'L')
-                    if i <= n - 4:
-                        matches += cross_search(puzzle, i, j, 'DL')
-                if i <= n - 4:
-                    matches += cross_search(puzzle, i, j, 'D')
-                    if j <= m - 4:
-                        matches += cross_search(puzzle, i, j, 'DR')
-                if j <= m - 4:
-                    matches += cross_search(puzzle, i, j, 'R')
-                    if i >= 3:
-                        matches += cross_search(puzzle, i, j, 'UR')
-    return matches
+    oriented in any of the 8 cardinal and diagonal directions. The puzzle must
+    be padded by at least 1 cell.
+    """
+    return sum(word_search(puzzle, ['XMAS'])['XMAS'].values())
 
+def part1_automaton(puzzle: Grid) -> int:
+    """
+    Returns the same as part1, matching with the automaton used for long word
+    lists.
+    """
+    return sum(word_search(puzzle, ['XMAS'], automaton=True)['XMAS'].values())
 
-def part2(puzzle: List[str]) -> int:
+
+def part2(puzzle: Grid) -> int:
     """
     Returns the number of crossed "MAS" or "SAM" strings, where two diagonal
-    instances of the string intersect at the letter "A".
-    """
-    n = len(puzzle)
-    m = len(puzzle[0])
-
-    matches = 0
-    for i in range(n - 2):
-        row = puzzle[i].strip()
-        for j in range(m - 2):
-            letter = row[j]
-            if letter == 'M':
-                if not cross_search(puzzle, i, j, 'DR', target='AS'):
-                    continue
-                if row[j + 2] == 'M':
-                    matches += cross_search(puzzle, i, j + 2, 'DL', target='AS')
-                elif row[j + 2] == 'S':
-                    matches += cross_search(puzzle, i, j + 2, 'DL', target='AM')
-            elif letter == 'S':
-                if not cross_search(puzzle, i, j, 'DR', target='AM'):
-                    continue
-                if row[j + 2] == 'M':
-                    matches += cross_search(puzzle, i, j + 2, 'DL', target='AS')
-                elif row[j + 2] == 'S':
-                    matches += cross_search(puzzle, i, j + 2, 'DL', target='AM')
+    instances of the string intersect at the letter "A". The puzzle must be
+    padded by at least 1 cell.
+    """
+    return sum(is_crossed(puzzle, idx) for idx in puzzle.find_all(ord('A')))
+
+
+# Vectorised template matching, over every position of the grid at once
+
+WILDCARD = '.'  # Template cells matching any letter
+
+Template = Sequence[str]
+
+# The four rotations of two crossed "MAS" strings
+XMAS_TEMPLATES: Tuple[Template, ...] = (
+    ('M.S', '.A.', 'M.S'),
+    ('M.M', '.A.', 'S.S'),
+    ('S.M', '.A.', 'S.M'),
+    ('S.S', '.A.', 'M.M'),
+)
+
+
+def letter_array(puzzle: Grid):
+    """
+    Returns the cells of the puzzle, without padding, as a 2D uint8 array
+    sharing memory with the grid.
+    """
+    p = puzzle.padding
+    cells = np.frombuffer(puzzle.cells, dtype=np.uint8).reshape(-1, puzzle.stride)
+    return cells[p:p + puzzle.height, p:p + puzzle.width]
+
+def template_mask(letters, template: Template):
+    """
+    Returns a boolean array of whether the template matches with its top left
+    corner at each position of the letters at which it fits, as the conjunction
+    of the letters shifted by the offset of each non-wildcard template cell
+    being equal to that cell.
+    """
+    height = letters.shape[0] - len(template) + 1
+    width = letters.shape[1] - max(map(len, template), default=0) + 1
+    mask = np.ones((max(height, 0), max(width, 0)), dtype=bool)
+    for di, row in enumerate(template):
+        for dj, letter in enumerate(row):
+            if letter != WILDCARD and mask.size:
+                mask &= letters[di:di + mask.shape[0], dj:dj + mask.shape[1]] == ord(letter)
+    return mask
+
+def count_templates(puzzle: Grid, templates: Iterable[Template]) -> List[int]:
+    """
+    Returns the number of matches of each template in the puzzle, where each
+    template is a list of rows of letters or wildcards.
+    """
+    letters = letter_array(puzzle)
+    return [int(template_mask(letters, template).sum()) for template in templates]
+
+def locate_templates(puzzle: Grid, templates: Iterable[Template]) -> List:
+    """
+    Returns the (row, column) coordinate of the top left corner of each match
+    of each template in the puzzle, as an array of shape (matches, 2).
+    """
+    letters = letter_array(puzzle)
+    return [np.argwhere(template_mask(letters, template)) for template in templates]
+
+def part2_numpy(puzzle: Grid) -> int:
+    """
+    Returns the same as part2, matching the rotations of the crossed strings
+    across the whole puzzle at once.
+    """
+    return sum(count_templates(puzzle, XMAS_TEMPLATES))
+
+
+# Streaming solvers, keeping only the last few rows. Each row is kept as one
+# integer per letter, with a byte per column, so a whole row of positions is
+# tested at once with shifts and ands
+
+def lane_tables(letters: Iterable[int]) -> Dict[int, bytes]:
+    """
+    Returns a bytes.translate table for each of the given letters, mapping that
+    letter to 1 and every other byte to 0.
+    """
+    return {letter: bytes(int(b == letter) for b in range(256)) for letter in letters}
+
+def lane_masks(row: bytes, tables: Dict[int, bytes]) -> Dict[int, int]:
+    """
+    Returns an integer for each letter with a table, with the byte at each
+    column of the row (least significant first) set to 1 if the row holds
+    that letter there, and 0 otherwise.
+    """
+    return {letter: int.from_bytes(row.translate(table), 'little')
+            for letter, table in tables.items()}
+
+def diagonal_matches(window: Sequence[Dict[int, int]], word: bytes, slope: int) -> int:
+    """
+    Returns the lane mask of the columns at which the word starts in the first
+    of the rows in the window, reading one letter per row and moving slope
+    columns (-1, 0 or 1) per row.
+    """
+    matches = window[0][word[0]]
+    for k in range(1, len(word)):
+        lanes = window[k][word[k]]
+        matches &= lanes >> (8 * k) if slope > 0 else lanes << (8 * k) if slope < 0 else lanes
     return matches
 
+def stream_matches(lines: Iterable[Union[str, bytes]], word: str = 'XMAS', cross: str = 'MAS'
+        ) -> Iterator[Tuple[int, int]]:
+    """
+    Reads the puzzle one row at a time from the given lines (e.g. an open
+    file), and yields the running number of occurrences of the word in any of
+    the 8 directions (as in part1), and of crossed pairs of the cross word
+    along both diagonals of a square (as in part2), after each row.
+
+    Each match is counted when the last of its rows arrives, so only the last
+    max(len(word), len(cross)) rows are kept, and no match is counted twice.
+    """
+    word, cross = word.encode(), cross.encode()
+    backward, cross_backward = word[::-1], cross[::-1]
+    tables = lane_tables(set(word + cross))
+    window = deque(maxlen=max(len(word), len(cross)))
+
+    n_words = n_crosses = 0
+    for line in lines:
+        row = line.encode() if isinstance(line, str) else line
+        if not (row := row.rstrip(b'\r\n')):
+            continue
+        window.append(lane_masks(row, tables))
+        n_words += count_overlapping(row, word) + count_overlapping(row, backward)
+
+        if len(word) <= len(window):
+            rows = list(window)[-len(word):]
+            for slope in (-1, 0, 1):
+                n_words += diagonal_matches(rows, word, slope).bit_count()
+                n_words += diagonal_matches(rows, backward, slope).bit_count()
+
+        if len(cross) <= len(window):
+            rows = list(window)[-len(cross):]
+            down_right = diagonal_matches(rows, cross, 1) | diagonal_matches(rows, cross_backward, 1)
+            down_left = diagonal_matches(rows, cross, -1) | diagonal_matches(rows, cross_backward, -1)
+            n_crosses += (down_right & (down_left >> (8 * (len(cross) - 1)))).bit_count()
+
+        yield n_words, n_crosses
+
+def count_matches_stream(lines: Iterable[Union[str, bytes]], word: str = 'XMAS', cross: str = 'MAS'
+        ) -> Tuple[int, int]:
+    """
+    Returns the number of occurrences of the word, and of crossed pairs of the
+    cross word, as in stream_matches.
+    """
+    counts = (0, 0)
+    for counts in stream_matches(lines, word, cross):
+        pass
+    return counts
+
+def part1_streaming(path: str) -> int:
+    """
+    Returns the same as part1 for the input file at the given path.
+    """
+    with open(path, 'rb') as f:
+        return count_matches_stream(f)[0]
+
+def part2_streaming(path: str) -> int:
+    """
+    Returns the same as part2 for the input file at the given path.
+    """
+    with open(path, 'rb') as f:
+        return count_matches_stream(f)[1]
+
 
 if __name__ == '__main__':
     with open('example.txt') as f:
-        puzzle = f.readlines()
+        puzzle = Grid.from_lines(f.readlines(), padding=3)
     assert (ans := part1(puzzle)) == 18, ans
     assert (ans := part2(puzzle)) == 9, ans
 
     with open('input.txt') as f:
-        puzzle = f.readlines()
+        puzzle = Grid.from_lines(f.readlines(), padding=3)
     print('Part 1:', part1(puzzle))
     print('Part 2:', part2(puzzle))
@@ -1,95 +1,187 @@
 """Day 5: Print Queue"""
 
+import heapq
+import os
+import sys
+
+from array import array
 from collections import defaultdict
-from typing import List
+from typing import Dict, Iterable, List, Sequence, Set, Tuple, Union
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc.ints import IntTable
+from aoc.optional import lazy_import
+
+np = lazy_import('numpy')
+
+
+class Rules:
+    """
+    The page ordering rules, indexed as the set of (before, after) page pairs
+    for constant-time lookup of a single rule, and as the set of pages which
+    must come after each page, for walking the rules out of a page.
+    """
+
+    __slots__ = ('pairs', 'successors')
 
+    def __init__(self, pairs: Set[Tuple[int, int]]) -> None:
+        self.pairs = pairs
+        self.successors: Dict[int, Set[int]] = defaultdict(set)
+        for a, b in pairs:
+            self.successors[a].add(b)
 
-def list_idx(l: List, o: object) -> int:
+def parse_rules(constraints: Iterable[str]) -> Rules:
     """
-    Returns the index of the given object in the given list, or None if the
-    object does not occur in the list.
+    Returns the index of the given rules, each of the form "a|b".
     """
-    for i, obj in enumerate(l):
-        if obj == o: return i
-    return None
+    pairs = set()
+    for ordered_pair in constraints:
+        a, b = map(int, ordered_pair.split('|'))
+        pairs.add((a, b))
+    return Rules(pairs)
 
-def correctly_ordered(constraints: List[str], pages: List[int]) -> bool:
+def correctly_ordered(rules: Rules, pages: List[int]) -> bool:
     """
-    Returns True if the set of pages conforms to all given constraints.
+    Returns True if the set of pages conforms to all given rules.
     """
     for i in range(1, len(pages)):
-        if f'{pages[i]}|{pages[i - 1]}' in constraints:
+        if (pages[i], pages[i - 1]) in rules.pairs:
             return False
     return True
 
-def relevant_constraints(constraints: List[str], pages: List[int]) -> List[str]:
+def reorder(rules: Rules, pages: List[int]) -> List[int]:
     """
-    Returns the subset of constraints for which both pages in the constraint
-    occur within the given set of page numbers.
+    Returns the pages ordered to conform to all rules between them, by a
+    topological sort of the rules restricted to the given pages. Of the pages
+    which may come next, the one given first is always taken, so the order is
+    deterministic and pages only move where the rules require it. (Pages with
+    no rule between them may still swap, e.g. to move a page after a page
+    given later.)
     """
-    relevant = []
-    for ordered_pair in constraints:
-        a, b = map(int, ordered_pair.split('|'))
-        if a in pages and b in pages:
-            relevant.append(ordered_pair)
-    return relevant
-
-
-def part1(constraints: List[str], updates: List[int]) -> int:
+    position = {page: k for k, page in enumerate(pages)}
+    on_page = set(pages)
+    successors = {page: rules.successors.get(page, set()) & on_page for page in pages}
+    n_before = dict.fromkeys(pages, 0)
+    for after in successors.values():
+        for page in after:
+            n_before[page] += 1
+
+    queue = [position[page] for page in pages if n_before[page] == 0]
+    ordered = []
+    while queue:
+        page = pages[heapq.heappop(queue)]
+        ordered.append(page)
+        for succ in successors[page]:
+            n_before[succ] -= 1
+            if n_before[succ] == 0:
+                heapq.heappush(queue, position[succ])
+
+    # Pages on a cycle of rules cannot be ordered; leave them where they were
+    if len(ordered) < len(pages):
+        placed = set(ordered)
+        ordered += [page for page in pages if page not in placed]
+    return ordered
+
+
+def part1(rules: Rules, updates: List[List[int]]) -> int:
     """
-    Evaluates each set of updates against the given set of constraints and
-    returns the sum of the middle page number of each correctly ordered set.
+    Evaluates each set of updates against the given set of rules and returns
+    the sum of the middle page number of each correctly ordered set.
     """
     midpage_sum = 0
     for pages in updates:
-        if correctly_ordered(constraints, pages):
+        if correctly_ordered(rules, pages):
             midpage_sum += pages[len(pages) // 2]
     return midpage_sum
 
 
-def part2(constraints: List[str], updates: List[str]) -> int:
+def part2(rules: Rules, updates: List[List[int]]) -> int:
     """
-    Solves the given constraint satisfaction problem for each set of updates,
-    reordering misordered sets and returning the sum of the middle page number
-    of each reordered set.
+    Reorders each incorrectly ordered set of updates to satisfy the given set
+    of rules, returning the sum of the middle page number of each reordered
+    set.
     """
-    # Remove the update sets which are already correctly ordered -- irrelevant
-    updates = [u for u in updates if not correctly_ordered(constraints, u)]
-
     midpage_sum = 0
     for pages in updates:
-        csp = defaultdict(list)
-        queue = relevant_constraints(constraints, pages)
+        if not correctly_ordered(rules, pages):
+            # NOTE: every set of updates has an odd number of pages
+            midpage_sum += reorder(rules, pages)[len(pages) // 2]
+    return midpage_sum
 
-        while len(queue) > 0:
-            ordered_pair = queue.pop(0)
-            a, b = map(int, ordered_pair.split('|'))
-            idx_a = list_idx(pages, a)
-            idx_b = list_idx(pages, b)
 
-            if idx_a > idx_b:
-                pages.insert(idx_b, pages.pop(idx_a))
-                queue = csp[a] + queue
+# Vectorised check of every update at once
 
-            csp[a].append(ordered_pair)
+def flatten_updates(updates: Iterable[Sequence[int]]) -> IntTable:
+    """
+    Returns the pages of all updates in one flat array, with the offset at
+    which each update starts.
+    """
+    values = array('q')
+    offsets = array('q', [0])
+    for pages in updates:
+        values.extend(pages)
+        offsets.append(len(values))
+    return IntTable(values, offsets)
 
-        # NOTE: every set of updates has an odd number of pages
-        midpage_sum += pages[len(pages) // 2]
+def precedence_matrix(rules: Rules, size: int):
+    """
+    Returns a dense boolean array in which [a, b] is set if a rule requires page
+    a to come before page b, for pages less than size.
+    """
+    matrix = np.zeros((size, size), dtype=bool)
+    if rules.pairs:
+        before, after = np.array(list(rules.pairs), dtype=np.int64).T
+        matrix[before, after] = True
+    return matrix
 
-    return midpage_sum
+def check_updates(rules: Rules, updates: Union[IntTable, Iterable[Sequence[int]]]):
+    """
+    Returns a boolean array of whether each update is correctly ordered, as
+    defined by correctly_ordered, and the sum of the middle page number of
+    each correctly ordered update. Every adjacent pair of pages is looked up
+    in the precedence matrix in a single gather.
+    """
+    if not isinstance(updates, IntTable):
+        updates = flatten_updates(updates)
+    pages = np.frombuffer(updates.values, dtype=np.int64)
+    offsets = np.frombuffer(updates.offsets, dtype=np.int64)
+    lengths = np.diff(offsets)
+
+    size = max(max(map(max, rules.pairs), default=0), int(pages.max(initial=0))) + 1
+    matrix = precedence_matrix(rules, size)
+
+    # A pair is misordered if a rule requires its second page first; pairs
+    # spanning the end of one update and the start of the next are ignored
+    misordered = matrix[pages[1:], pages[:-1]]
+    boundaries = offsets[1:-1]
+    misordered[boundaries[(boundaries > 0) & (boundaries < len(pages))] - 1] = False
+    update_of_pair = np.repeat(np.arange(len(lengths)), lengths)[1:]
+    valid = np.ones(len(lengths), dtype=bool)
+    valid[update_of_pair[misordered]] = False
+
+    middles = offsets[:-1] + lengths // 2
+    counted = valid & (lengths > 0)
+    return valid, int(pages[middles[counted]].sum())
+
+def part1_numpy(rules: Rules, updates: Union[IntTable, Iterable[Sequence[int]]]) -> int:
+    """
+    Returns the same as part1, checking all updates at once.
+    """
+    return check_updates(rules, updates)[1]
 
 
 if __name__ == '__main__':
     with open('example-pt1.txt') as f:
-        constraints = [c.strip() for c in f.readlines()]
+        rules = parse_rules(c.strip() for c in f.readlines())
     with open('example-pt2.txt') as f:
         updates = [list(map(int, u.split(','))) for u in f.readlines()]
-    assert (ans := part1(constraints, updates)) == 143, ans
-    assert (ans := part2(constraints, updates)) == 123, ans
+    assert (ans := part1(rules, updates)) == 143, ans
+    assert (ans := part2(rules, updates)) == 123, ans
 
     with open('input-pt1.txt') as f:
-        constraints = [c.strip() for c in f.readlines()]
+        rules = parse_rules(c.strip() for c in f.readlines())
     with open('input-pt2.txt') as f:
         updates = [list(map(int, u.split(','))) for u in f.readlines()]
-    print('Part 1:', part1(constraints, updates))
-    print('Part 2:', part2(constraints, updates))
+    print('Part 1:', part1(rules, updates))
+    print('Part 2:', part2(rules, updates))
@@ -1,113 +1,113 @@
 """Day 6: Guard Gallivant"""
 
-from copy import deepcopy
-from typing import List, Tuple
+import os
+import sys
 
-from tqdm import tqdm
+from array import array
 
-CoordXY = Tuple[int, int]
-Map = List[List[int]]
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-ROTATE = lambda dir: {'^': '>', '>': 'v', 'v': '<', '<': '^'}[dir]
+from aoc.grid import OUTSIDE, Grid
 
-NEXT_X = lambda x, dir: {'<': x - 1, '>': x + 1}.get(dir, x)
-NEXT_Y = lambda y, dir: {'^': y - 1, 'v': y + 1}.get(dir, y)
-NEXT_XY = lambda x, y, dir: (NEXT_X(x, dir), NEXT_Y(y, dir))
+# The guard's state is its cell index in the map and its direction, where the
+# direction is an index into Grid.steps (0: '^', 1: '>', 2: 'v', 3: '<'),
+# packed into a single integer as idx * 4 + direction
+State = int
 
-def locate_guard(map: Map) -> Tuple[CoordXY, str]:
+OBSTACLE = ord('#')
+
+ROTATE = lambda direction: (direction + 1) % 4
+
+
+def locate_guard(map: Grid) -> State:
     """
-    Returns the (x, y) coordinate of the "^" symbol in the map.
+    Returns the state of the guard, from the "^" symbol in the map.
     """
-    for i, row in enumerate(map):
-        for j, cell in enumerate(row):
-            if cell == '^':
-                return (j, i), cell
-    raise ValueError('guard not found in map')
+    if (idx := map.find(ord('^'))) is None:
+        raise ValueError('guard not found in map')
+    return idx * 4
 
-def move_guard(map: Map, x: int, y: int, direction: str) -> Tuple[CoordXY, str]:
+def move_guard(map: Grid, state: State) -> State:
     """
-    Returns the next (x, y) coordinate and direction of the guard in the map.
+    Returns the next state of the guard in the map. The map must be padded,
+    and the guard has exited the map once on a padding cell.
     """
-    n, m = len(map), len(map[0])
-    _x, _y = NEXT_XY(x, y, direction)
-    if not (-1 < _x < m and -1 < _y < n):
-        return (_x, _y), direction
-    if map[_y][_x] == '#':
-        return (x, y), ROTATE(direction)
+    idx, direction = divmod(state, 4)
+    if map[idx + map.steps[direction]] == OBSTACLE:
+        return idx * 4 + ROTATE(direction)
     else:
-        return (_x, _y), direction
+        return state + 4 * map.steps[direction]
 
-def trace_path(map: Map, x0: int, y0: int, init_dir: str) -> List[Tuple[CoordXY, str]]:
+def trace_path(map: Grid, state0: State) -> array:
     """
-    Returns the path through the map traversed by the guard from the given
-    starting coordinate and direction.
+    Returns the states of the guard along its path through the map from the
+    given starting state.
     """
-    n, m = len(map), len(map[0])
-    path = [((x0, y0), init_dir)]
-    x, y, direction = x0, y0, init_dir
+    path = array('q', [state0])
+    state = state0
     while True:
-        (x, y), direction = move_guard(map, x, y, direction)
-        if not (-1 < x < m and -1 < y < n):
+        state = move_guard(map, state)
+        if map[state >> 2] == OUTSIDE:
             break
-        path.append(((x, y), direction))
+        path.append(state)
     return path
 
-def has_loop(map: Map, x0: int, y0: int, init_dir: str) -> bool:
+def has_loop(map: Grid, state0: State) -> bool:
     """
     Returns True if the map has a loop from the given starting state.
     """
-    n, m = len(map), len(map[0])
-    path = {(x0, y0, init_dir)}
-    x, y, direction = x0, y0, init_dir
+    visited = bytearray(4 * len(map))
+    visited[state0] = True
+    state = state0
     while True:
-        (x, y), direction = move_guard(map, x, y, direction)
-        if not (-1 < x < m and -1 < y < n):
+        state = move_guard(map, state)
+        if map[state >> 2] == OUTSIDE:
             return False
-        if (x, y, direction) in path:
+        if visited[state]:
             return True
-        path.add((x, y, direction))
+        visited[state] = True
 
 
-def part1(map: Map) -> int:
+def part1(map: Grid) -> int:
     """
     Returns the number of distinct coordinates traversed by the guard until
     exiting the map.
     """
-    (x0, y0), init_dir = locate_guard(map)
-    return len(set(t[0] for t in trace_path(map, x0, y0, init_dir)))
+    return len({state >> 2 for state in trace_path(map, locate_guard(map))})
 
 
-def part2(map: Map, show_progress: bool = False) -> int:
+def part2(map: Grid, show_progress: bool = False) -> int:
     """
     Returns the number of distinct coordinates where an obstacle could be
     placed to cause the guard to enter a looping path.
     """
-    loop_wrapper = lambda z: tqdm(z) if show_progress else z
+    loop_wrapper = lambda z: z
+    if show_progress:
+        from tqdm import tqdm  # Only needed (and imported) for progress bars
+        loop_wrapper = tqdm
 
-    (x0, y0), init_dir = locate_guard(map)
-    path = trace_path(map, x0, y0, init_dir)
+    state0 = locate_guard(map)
+    path = trace_path(map, state0)
 
     obstacle_candidates = set()
-    for (x, y), direction in loop_wrapper(path[:-1]):
-        _x = NEXT_X(x, direction)
-        _y = NEXT_Y(y, direction)
-        if map[_y][_x] == '#':
+    for state in loop_wrapper(path[:-1]):
+        idx, direction = divmod(state, 4)
+        _idx = idx + map.steps[direction]
+        if map[_idx] == OBSTACLE:
             continue
-        _map = deepcopy(map)
-        _map[_y][_x] = '#'
-        if has_loop(_map, x0, y0, init_dir):
-            obstacle_candidates.add((_x, _y))
+        if has_loop(map.with_cell(_idx, OBSTACLE), state0):
+            obstacle_candidates.add(_idx)
 
     return len(obstacle_candidates)
 
 
 if __name__ == '__main__':
     with open('example.txt') as f:
-        map = [[c for c in row.strip()] for row in f.readlines()]
+        map = Grid.from_lines(f.readlines(), padding=1)
     assert (ans := part1(map)) == 41, ans
     assert (ans := part2(map)) == 6, ans
 
     with open('input.txt') as f:
-        map = [[c for c in row.strip()] for row in f.readlines()]
+        map = Grid.from_lines(f.readlines(), padding=1)
     print('Part 1:', part1(map))
     print('Part 2:', part2(map, show_progress=True))
@@ -1,8 +1,13 @@
 """Day 7: Bridge Repair"""
 
-from typing import List
+import os
+import sys
 
-from tqdm import tqdm
+from typing import Iterable, List, Sequence
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc.ints import read_ints
 
 
 def is_possible_equation(target: int, inputs: List[int], concat: bool = False) -> bool:
@@ -26,33 +31,36 @@ def is_possible_equation(target: int, inputs: List[int], concat: bool = False) -
                is_possible_equation(target, [in0 * in1] + inputs[2:])
 
 
-def part1(equations: List[str], show_progress: bool = False) -> int:
+def part1(equations: Iterable[Sequence[int]], show_progress: bool = False) -> int:
     """
     Returns the sum of the targets which can be achieved by applying only the
-    "+" and "*" operators to the inputs in left-to-right order.
+    "+" and "*" operators to the inputs in left-to-right order. Each equation
+    is the target followed by its inputs.
     """
-    loop_wrapper = lambda z: tqdm(z) if show_progress else z
+    loop_wrapper = lambda z: z
+    if show_progress:
+        from tqdm import tqdm  # Only needed (and imported) for progress bars
+        loop_wrapper = tqdm
 
     target_sum = 0
-    for eq in loop_wrapper(equations):
-        target, inputs = eq.split(':')
-        if is_possible_equation(int(target), list(map(int, inputs.split()))):
-            target_sum += int(target)
+    for target, *inputs in loop_wrapper(equations):
+        if is_possible_equation(target, inputs):
+            target_sum += target
     return target_sum
 
 
-def part2(equations: List[str], show_progress: bool = False) -> int:
+def part2(equations: Iterable[Sequence[int]], show_progress: bool = False) -> int:
     """
     Returns the sum of the targets which can be achieved by applying the "+",
     "*" and "||" (concatenation) operators to the inputs in left-to-right order.
     """
-    loop_wrapper = lambda z: tqdm(z) if show_progress else z
+    loop_wrapper = lambda z: z
+    if show_progress:
+        from tqdm import tqdm  # Only needed (and imported) for progress bars
+        loop_wrapper = tqdm
 
     target_sum = 0
-    for eq in loop_wrapper(equations):
-        target, inputs = eq.split(':')
-        target = int(target)
-        inputs = list(map(int, inputs.split()))
+    for target, *inputs in loop_wrapper(equations):
         if is_possible_equation(target, inputs, concat=True):
             target_sum += target
 
@@ -60,12 +68,10 @@ def part2(equations: List[str], show_progress: bool = False) -> int:
 
 
 if __name__ == '__main__':
-    with open('example.txt') as f:
-        equations = f.readlines()
+    equations = read_ints('example.txt')
     assert (ans := part1(equations)) == 3749, ans
     assert (ans := part2(equations)) == 11387, ans
 
-    with open('input.txt') as f:
-        equations = f.readlines()
+    equations = read_ints('input.txt')
     print('Part 1:', part1(equations, show_progress=True))
     print('Part 2:', part2(equations, show_progress=True))